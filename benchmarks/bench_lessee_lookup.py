@@ -0,0 +1,132 @@
+"""
+Benchmark airline lookup: full-table scan in Python vs indexed find_lessee_by_name
+
+Seeds a throwaway set of lessees (each with assets and components) into the
+database from DATABASE_URL, times both lookups and removes the seed data.
+Run the migrations first (prisma migrate deploy).
+
+Usage:
+    python -m benchmarks.bench_lessee_lookup [lessee_count]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+from src.services.operations_service import OperationsService, normalize_lessee_name
+from src.utils.parser.month_key import month_key
+
+DEFAULT_LESSEES = 5000
+ASSETS_PER_LESSEE = 2
+COMPONENTS_PER_ASSET = 3
+REPEATS = 5
+SEED_MONTH_PREFIX = "bench-"
+SEED_MONTHS = [f"{SEED_MONTH_PREFIX}{i:02d}" for i in range(12)]
+COMPONENT_FIELDS = (
+    "lastUtilizationDate", "flightHours", "flightCycles", "apuHours", "apuCycles",
+    "tsnAtPeriod", "csnAtPeriod", "tsnAtPeriodEnd", "csnAtPeriodEnd", "lastTsnCsnUpdate",
+    "lastTsnUtilization", "lastCsnUtilization", "attachmentStatus", "engineThrust",
+    "status", "utilReportStatus", "asset_status", "derate",
+)
+
+
+async def _seed(service: OperationsService, lessee_count: int) -> None:
+    lessees, assets, components = [], [], []
+    for month in SEED_MONTHS:
+        await service.db.query_raw("SELECT 1 FROM ensure_month_partitions($1)", month_key(month))
+
+    for i in range(lessee_count):
+        name = f"Bench Airline {i}"
+        month = SEED_MONTHS[i % len(SEED_MONTHS)]
+        lessee_id = uuid.uuid4().hex
+        lessees.append({
+            "id": lessee_id,
+            "name": name,
+            "normalizedName": normalize_lessee_name(name),
+            "month": month,
+            "monthKey": month_key(month),
+            "fileName": "bench.pdf",
+        })
+        for a in range(ASSETS_PER_LESSEE):
+            asset_id = uuid.uuid4().hex
+            assets.append({
+                "id": asset_id,
+                "name": "A320",
+                "serialNumber": f"{i}-{a}",
+                "registrationNumber": f"REG-{i}-{a}",
+                "validation_status": "valid",
+                "report_status": "received",
+                "obligation_status": "met",
+                "month": month,
+                "monthKey": month_key(month),
+                "lesseeId": lessee_id,
+            })
+            for c in range(COMPONENTS_PER_ASSET):
+                component = {field: "1,234" for field in COMPONENT_FIELDS}
+                component.update({
+                    "type": "Engine",
+                    "serialNumber": f"{i}-{a}-{c}",
+                    "month": month,
+                    "monthKey": month_key(month),
+                    "assetId": asset_id,
+                })
+                components.append(component)
+
+    await service.db.lessee.create_many(data=lessees)
+    await service.db.asset.create_many(data=assets)
+    await service.db.component.create_many(data=components)
+
+
+async def _scan_lookup(service: OperationsService, name: str):
+    """The original extract_from_url check: load and format everything, then scan"""
+    for lessee in await service.get_all_operations():
+        if lessee.get("name", "").casefold() == name.casefold():
+            return lessee
+    return None
+
+
+def _report(label: str, samples) -> None:
+    print(
+        f"{label:<22}{statistics.median(samples) * 1000:>12.1f}"
+        f"{min(samples) * 1000:>12.1f}{max(samples) * 1000:>12.1f}"
+    )
+
+
+async def main(lessee_count: int) -> None:
+    service = OperationsService()
+    await service.connect()
+
+    try:
+        print(f"🌱 Seeding {lessee_count} lessees ({ASSETS_PER_LESSEE} assets, "
+              f"{COMPONENTS_PER_ASSET} components each)...")
+        await _seed(service, lessee_count)
+
+        target = f"BENCH airline {lessee_count - 1}"
+        results = {"scan": [], "indexed": []}
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            scanned = await _scan_lookup(service, target)
+            results["scan"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            found = await service.find_lessee_by_name(target)
+            results["indexed"].append(time.perf_counter() - start)
+
+            assert scanned is not None and found is not None and scanned["id"] == found["id"]
+
+        print(f"{'lookup':<22}{'median ms':>12}{'min ms':>12}{'max ms':>12}")
+        _report("get_all + scan", results["scan"])
+        _report("find_lessee_by_name", results["indexed"])
+
+    finally:
+        for month in SEED_MONTHS:
+            await service.delete_operations_by_month(month)
+        await service.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LESSEES))
@@ -0,0 +1,50 @@
+"""
+Benchmark the month / foreign-key indexes on lessees, assets and components
+
+Historical: these single-column indexes were added by the
+20261017110000_add_month_and_foreign_key_indexes migration and dropped by
+20261017140000_partition_operations_by_month, which replaced them with
+monthKey partitions and composite (FK, monthKey) indexes. The shipped schema
+no longer has them; this script recreates them temporarily to reproduce the
+original comparison, with queries that filter on month alone as they did
+then. bench_partition_indexes measures the current schema.
+
+Point DATABASE_URL at a local Postgres: the indexes are dropped and
+recreated while the benchmark runs, and the shipped indexes are restored
+at the end.
+
+Usage:
+    python -m benchmarks.bench_month_indexes [years] [lessees_per_month]
+"""
+import asyncio
+
+from benchmarks.operations_bench import cli_args, month_params, run_index_benchmark
+
+INDEXES = {
+    "lessees_month_idx": 'CREATE INDEX "lessees_month_idx" ON "lessees"("month")',
+    "assets_lesseeId_idx": 'CREATE INDEX "assets_lesseeId_idx" ON "assets"("lesseeId")',
+    "assets_month_idx": 'CREATE INDEX "assets_month_idx" ON "assets"("month")',
+    "components_assetId_idx": 'CREATE INDEX "components_assetId_idx" ON "components"("assetId")',
+    "components_month_idx": 'CREATE INDEX "components_month_idx" ON "components"("month")',
+}
+
+# SQL equivalents of what Prisma ran for each endpoint before partitioning
+QUERIES = {
+    "lessees by month": 'SELECT * FROM "lessees" WHERE "month" = $1',
+    "assets include": (
+        'SELECT * FROM "assets" WHERE "lesseeId" IN '
+        '(SELECT "id" FROM "lessees" WHERE "month" = $1)'
+    ),
+    "components include": (
+        'SELECT * FROM "components" WHERE "assetId" IN '
+        '(SELECT "a"."id" FROM "assets" "a" JOIN "lessees" "l" ON "l"."id" = "a"."lesseeId" WHERE "l"."month" = $1)'
+    ),
+    "assets by month": 'SELECT * FROM "assets" WHERE "month" = $1',
+    "components by month": 'SELECT * FROM "components" WHERE "month" = $1',
+}
+
+DELETE_SQL = 'DELETE FROM "lessees" WHERE "month" = $1'
+
+
+if __name__ == "__main__":
+    asyncio.run(run_index_benchmark(INDEXES, QUERIES, DELETE_SQL, month_params, **cli_args()))
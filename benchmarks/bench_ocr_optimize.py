@@ -0,0 +1,64 @@
+"""
+Benchmark and parity check for _optimize_image_for_ocr
+
+Compares the original four-pass PIL chain (Contrast, Sharpness, UnsharpMask,
+Brightness) with the fused LUT + single-kernel implementation, per page.
+
+Usage:
+    python -m benchmarks.bench_ocr_optimize [path/to/report.pdf] [dpi]
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+import fitz
+from PIL import Image
+
+from benchmarks.ocr_reference import diff_stats, legacy_optimize, within_tolerance
+from src.services.aircraft_service import _optimize_image_for_ocr
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PDF = ROOT / "samples" / "aircraft_report.pdf"
+
+
+def _timed(func, image: Image.Image) -> tuple[float, Image.Image]:
+    start = time.perf_counter()
+    result = func(image)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    pdf_path = sys.argv[1] if len(sys.argv) > 1 else str(DEFAULT_PDF)
+    dpi = int(sys.argv[2]) if len(sys.argv) > 2 else 450
+    print(f"📄 {pdf_path} at {dpi} DPI")
+    print(f"{'page':>5}{'legacy (s)':>12}{'fused (s)':>11}{'speedup':>9}{'mean diff':>11}{'p99 diff':>10}")
+
+    failures = 0
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(len(doc)):
+            pix = doc.load_page(page_num).get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), alpha=False)
+            page = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+            legacy_time, legacy = _timed(legacy_optimize, page)
+            fused_time, fused = _timed(_optimize_image_for_ocr, page)
+            mean_diff, p99_diff = diff_stats(legacy, fused)
+
+            if not within_tolerance(mean_diff, p99_diff):
+                failures += 1
+
+            print(
+                f"{page_num + 1:>5}{legacy_time:>12.3f}{fused_time:>11.3f}"
+                f"{legacy_time / fused_time:>8.1f}x{mean_diff:>11.2f}{p99_diff:>10}"
+            )
+
+    if failures:
+        print(f"❌ {failures} page(s) outside parity tolerance")
+        sys.exit(1)
+    print("✅ Fused output within parity tolerance on every page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark operations response serialization: JSONResponse vs ORJSONResponse
+
+Builds Prisma-like lessee/asset/component records in memory (no database
+needed), formats them with OperationsService and renders the response body
+the way FastAPI does for each path:
+
+    current: dict -> jsonable_encoder -> JSONResponse (stdlib json)
+    orjson:  dict -> ORJSONResponse (orjson, no jsonable_encoder)
+
+Usage:
+    python -m benchmarks.bench_operations_serialization
+"""
+import os
+import statistics
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.services.operations_service import OperationsService
+
+COMPONENT_COUNTS = (1_000, 10_000, 100_000)
+COMPONENTS_PER_ASSET = 7
+ASSETS_PER_LESSEE = 20
+REPEATS = 5
+METRIC_FIELDS = (
+    "flightHours", "flightCycles", "apuHours", "apuCycles",
+    "tsnAtPeriod", "csnAtPeriod", "tsnAtPeriodEnd", "csnAtPeriodEnd",
+)
+
+
+def _component(i: int, now: datetime) -> SimpleNamespace:
+    fields = {field: "12,345" for field in METRIC_FIELDS}
+    fields.update({f"{field}Value": 12345.0 for field in METRIC_FIELDS})
+    return SimpleNamespace(
+        id=f"c{i}", type="Engine", serialNumber=f"ESN{i}", lastUtilizationDate="2024-06-30",
+        lastTsnCsnUpdate="2024-06-30", lastTsnUtilization="100", lastCsnUtilization="50",
+        attachmentStatus="Attached", engineThrust="27K", status="Active", utilReportStatus="Received",
+        asset_status="In service", derate="0", month="2024-06", createdAt=now, **fields
+    )
+
+
+def _build_lessees(component_count: int):
+    now = datetime.now()
+    asset_count = max(1, component_count // COMPONENTS_PER_ASSET)
+    lessee_count = max(1, asset_count // ASSETS_PER_LESSEE)
+
+    lessees = [
+        SimpleNamespace(id=f"l{i}", name=f"Lessee {i}", month="2024-06", fileName="report.pdf",
+                        createdAt=now, updatedAt=now, assets=[])
+        for i in range(lessee_count)
+    ]
+    for a in range(asset_count):
+        asset = SimpleNamespace(
+            id=f"a{a}", name="A320", serialNumber=f"MSN{a}", registrationNumber=f"REG{a}",
+            validation_status="valid", report_status="received", obligation_status="met",
+            month="2024-06", createdAt=now, components=[]
+        )
+        lessees[a % lessee_count].assets.append(asset)
+
+    assets = [asset for lessee in lessees for asset in lessee.assets]
+    for c in range(component_count):
+        assets[c % len(assets)].components.append(_component(c, now))
+    return lessees
+
+
+def _render_current(service: OperationsService, lessees) -> bytes:
+    data = [service._format_lessee(lessee) for lessee in lessees]
+    content = jsonable_encoder({"success": True, "data": data, "month": "2024-06", "count": len(data)})
+    return JSONResponse(content=content).body
+
+
+def _render_orjson(service: OperationsService, lessees) -> bytes:
+    data = [service._format_lessee(lessee) for lessee in lessees]
+    return ORJSONResponse(content={"success": True, "data": data, "month": "2024-06", "count": len(data)}).body
+
+
+def _measure(render, service: OperationsService, lessees):
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        body = render(service, lessees)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, len(body)
+
+
+def main() -> None:
+    service = OperationsService()
+    print(f"{'components':>11}{'current ms':>13}{'orjson ms':>12}{'speedup':>10}{'body MB':>10}")
+
+    for count in COMPONENT_COUNTS:
+        lessees = _build_lessees(count)
+        current_ms, size = _measure(_render_current, service, lessees)
+        orjson_ms, _ = _measure(_render_orjson, service, lessees)
+        print(f"{count:>11}{current_ms:>13.1f}{orjson_ms:>12.1f}"
+              f"{current_ms / orjson_ms:>9.1f}x{size / 1024 / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
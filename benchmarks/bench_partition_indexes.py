@@ -0,0 +1,41 @@
+"""
+Benchmark the foreign-key indexes on the month-partitioned operations tables
+
+Prints the EXPLAIN plan of each endpoint query and the get_operations_by_month
+latency without and with the composite (FK, monthKey) indexes. Month filters
+include monthKey, so plans also show partition pruning. See operations_bench
+for the seeding and measurement.
+
+Point DATABASE_URL at a local Postgres: the indexes are dropped and
+recreated while the benchmark runs.
+
+Usage:
+    python -m benchmarks.bench_partition_indexes [years] [lessees_per_month]
+"""
+import asyncio
+
+from benchmarks.operations_bench import SHIPPED_INDEXES, cli_args, month_key_params, run_index_benchmark
+
+# SQL equivalents of what Prisma runs for each endpoint
+QUERIES = {
+    "lessees by month": 'SELECT * FROM "lessees" WHERE "month" = $1 AND "monthKey" = $2',
+    "assets include": (
+        'SELECT * FROM "assets" WHERE "monthKey" = $2 AND "lesseeId" IN '
+        '(SELECT "id" FROM "lessees" WHERE "month" = $1 AND "monthKey" = $2)'
+    ),
+    "components include": (
+        'SELECT * FROM "components" WHERE "monthKey" = $2 AND "assetId" IN '
+        '(SELECT "a"."id" FROM "assets" "a" JOIN "lessees" "l" '
+        'ON "l"."id" = "a"."lesseeId" AND "l"."monthKey" = "a"."monthKey" '
+        'WHERE "l"."month" = $1 AND "l"."monthKey" = $2)'
+    ),
+    "assets by month": 'SELECT * FROM "assets" WHERE "month" = $1 AND "monthKey" = $2',
+    "components by month": 'SELECT * FROM "components" WHERE "month" = $1 AND "monthKey" = $2',
+}
+
+# The shared-partition fallback of delete_operations_by_month
+DELETE_SQL = 'DELETE FROM "lessees" WHERE "month" = $1 AND "monthKey" = $2'
+
+
+if __name__ == "__main__":
+    asyncio.run(run_index_benchmark(SHIPPED_INDEXES, QUERIES, DELETE_SQL, month_key_params, **cli_args()))
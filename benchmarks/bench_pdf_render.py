@@ -0,0 +1,88 @@
+"""
+Benchmark PDF rasterization: PNG round-trip list vs. streaming raw-sample generator
+
+Each variant runs in a fresh subprocess so the reported peak RSS belongs to
+that variant alone.
+
+Usage:
+    python -m benchmarks.bench_pdf_render [path/to/report.pdf]
+"""
+import io
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PDF = ROOT / "samples" / "aircraft_report.pdf"
+DPIS = (150, 450)
+VARIANTS = ("png_roundtrip", "streaming")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_png_roundtrip(pdf_path: str, dpi: int) -> int:
+    """The original pdf_to_images: PNG encode/decode per page, all pages kept"""
+    import fitz
+    from PIL import Image
+    from src.services.aircraft_service import _optimize_image_for_ocr
+
+    doc = fitz.open(pdf_path)
+    images = []
+    for page_num in range(len(doc)):
+        page = doc.load_page(page_num)
+        pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), alpha=False)
+        img = Image.open(io.BytesIO(pix.tobytes("png")))
+        images.append(_optimize_image_for_ocr(img))
+    doc.close()
+    return len(images)
+
+
+def _run_streaming(pdf_path: str, dpi: int) -> int:
+    from src.services.aircraft_service import iter_pdf_images
+
+    pages = 0
+    for _ in iter_pdf_images(pdf_path, dpi=dpi):
+        pages += 1
+    return pages
+
+
+def _child(variant: str, pdf_path: str, dpi: int) -> None:
+    runner = _run_png_roundtrip if variant == "png_roundtrip" else _run_streaming
+    start = time.perf_counter()
+    pages = runner(pdf_path, dpi)
+    elapsed = time.perf_counter() - start
+    print(f"{elapsed:.3f} {_peak_rss_mb():.1f} {pages}")
+
+
+def main() -> None:
+    pdf_path = str(Path(sys.argv[1]).resolve()) if len(sys.argv) > 1 else str(DEFAULT_PDF)
+    print(f"📄 {pdf_path}")
+    print(f"{'variant':<16}{'dpi':>6}{'pages':>7}{'time (s)':>11}{'peak RSS (MB)':>16}")
+
+    for dpi in DPIS:
+        for variant in VARIANTS:
+            result = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_pdf_render", "--child", variant, pdf_path, str(dpi)],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            elapsed, peak, pages = result.stdout.strip().splitlines()[-1].split()
+            print(f"{variant:<16}{dpi:>6}{pages:>7}{float(elapsed):>11.3f}{float(peak):>16.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        main()
@@ -0,0 +1,39 @@
+"""
+Reference for _optimize_image_for_ocr parity: the original PIL chain and the tolerance
+
+Shared by benchmarks/bench_ocr_optimize.py and tests/test_ocr_optimize.py so
+both agree on what "legacy" output is and how close the fused one must be.
+"""
+from typing import Tuple
+
+from PIL import Image, ImageChops, ImageEnhance, ImageFilter
+
+# Largest per-channel difference (0-255) still considered visually identical
+MAX_MEAN_DIFF = 2.0
+MAX_P99_DIFF = 24
+
+
+def legacy_optimize(image: Image.Image) -> Image.Image:
+    """The original four-pass enhancement chain"""
+    image = ImageEnhance.Contrast(image).enhance(1.2)
+    image = ImageEnhance.Sharpness(image).enhance(1.3)
+    image = image.filter(ImageFilter.UnsharpMask(radius=1, percent=120, threshold=2))
+    return ImageEnhance.Brightness(image).enhance(1.05)
+
+
+def diff_stats(a: Image.Image, b: Image.Image) -> Tuple[float, int]:
+    """Mean and 99th percentile of the per-pixel difference between two images"""
+    histogram = ImageChops.difference(a, b).convert("L").histogram()
+    total = sum(histogram)
+    mean = sum(i * count for i, count in enumerate(histogram)) / total
+
+    seen = 0
+    for value, count in enumerate(histogram):
+        seen += count
+        if seen >= total * 0.99:
+            return mean, value
+    return mean, 255
+
+
+def within_tolerance(mean_diff: float, p99_diff: int) -> bool:
+    return mean_diff <= MAX_MEAN_DIFF and p99_diff <= MAX_P99_DIFF
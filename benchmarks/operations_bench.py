@@ -0,0 +1,220 @@
+"""
+Shared harness for the operations index benchmarks
+
+Seeds a multi-year dataset with generate_series into the database from
+DATABASE_URL, then for each query prints the EXPLAIN plan and the
+get_operations_by_month latency with a set of indexes dropped ("before")
+and created ("after"). The seed partitions are dropped at the end and the
+shipped indexes are put back.
+
+Used by bench_month_indexes and bench_partition_indexes, which only
+provide the indexes and queries to compare.
+"""
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+
+from src.services.operations_service import OperationsService
+from src.utils.parser.month_key import month_key
+
+DEFAULT_YEARS = 3
+DEFAULT_LESSEES_PER_MONTH = 50
+ASSETS_PER_LESSEE = 20
+COMPONENTS_PER_ASSET = 7
+REPEATS = 5
+SEED_PREFIX = "bench-"
+
+# Indexes the current migrations create on the month-partitioned tables
+SHIPPED_INDEXES = {
+    "assets_lesseeId_monthKey_idx": 'CREATE INDEX "assets_lesseeId_monthKey_idx" ON "assets"("lesseeId", "monthKey")',
+    "components_assetId_monthKey_idx": (
+        'CREATE INDEX "components_assetId_monthKey_idx" ON "components"("assetId", "monthKey")'
+    ),
+}
+
+COMPONENT_TEXT_COLUMNS = (
+    "lastUtilizationDate", "flightHours", "flightCycles", "apuHours", "apuCycles",
+    "tsnAtPeriod", "csnAtPeriod", "tsnAtPeriodEnd", "csnAtPeriodEnd", "lastTsnCsnUpdate",
+    "lastTsnUtilization", "lastCsnUtilization", "attachmentStatus", "engineThrust",
+    "status", "utilReportStatus", "asset_status", "derate",
+)
+
+# Query parameters for a month, matching the $n placeholders of a script's queries
+QueryParams = Callable[[str], Tuple[str, ...]]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def month_params(month: str) -> Tuple[str, ...]:
+    """$1 = month"""
+    return (month,)
+
+
+def month_key_params(month: str) -> Tuple[str, ...]:
+    """$1 = month, $2 = its partition key"""
+    return month, month_key(month)
+
+
+def _seed_months(years: int) -> List[str]:
+    return [f"{SEED_PREFIX}{2020 + m // 12}-{m % 12 + 1:02d}" for m in range(years * 12)]
+
+
+async def _seed(service: OperationsService, years: int, lessees_per_month: int) -> None:
+    db = service.db
+    for month in _seed_months(years):
+        await db.query_raw("SELECT 1 FROM ensure_month_partitions($1)", month_key(month))
+
+    await db.execute_raw(
+        f"""
+        INSERT INTO "lessees" ("id", "name", "normalizedName", "month", "monthKey", "fileName", "updatedAt")
+        SELECT 'bl-' || m || '-' || l, 'Bench Lessee ' || l, 'bench lessee ' || l,
+               s."month", operations_month_key(s."month"), 'bench.pdf', now()
+        FROM generate_series(0, {years * 12 - 1}) m
+        CROSS JOIN LATERAL (
+            SELECT '{SEED_PREFIX}' || to_char(date '2020-01-01' + make_interval(months => m), 'YYYY-MM') AS "month"
+        ) s
+        CROSS JOIN generate_series(0, {lessees_per_month - 1}) l
+        """
+    )
+    await db.execute_raw(
+        f"""
+        INSERT INTO "assets" ("id", "name", "serialNumber", "registrationNumber", "validation_status",
+                              "report_status", "obligation_status", "month", "monthKey", "lesseeId")
+        SELECT "l"."id" || '-' || a, 'A320', 'MSN' || a, 'REG' || a, 'valid', 'received', 'met',
+               "l"."month", "l"."monthKey", "l"."id"
+        FROM "lessees" "l", generate_series(0, {ASSETS_PER_LESSEE - 1}) a
+        WHERE "l"."month" LIKE '{SEED_PREFIX}%'
+        """
+    )
+    columns = ", ".join(f'"{column}"' for column in COMPONENT_TEXT_COLUMNS)
+    values = ", ".join("'1,234'" for _ in COMPONENT_TEXT_COLUMNS)
+    await db.execute_raw(
+        f"""
+        INSERT INTO "components" ("id", "type", "serialNumber", {columns}, "month", "monthKey", "assetId")
+        SELECT "a"."id" || '-' || c, 'Engine', 'ESN' || c, {values}, "a"."month", "a"."monthKey", "a"."id"
+        FROM "assets" "a", generate_series(0, {COMPONENTS_PER_ASSET - 1}) c
+        WHERE "a"."month" LIKE '{SEED_PREFIX}%'
+        """
+    )
+    for table in ("lessees", "assets", "components"):
+        await db.execute_raw(f'ANALYZE "{table}"')
+
+
+async def _set_indexes(service: OperationsService, indexes: Dict[str, str], present: bool) -> None:
+    for name, create_sql in indexes.items():
+        await service.db.execute_raw(f'DROP INDEX IF EXISTS "{name}"')
+        if present:
+            await service.db.execute_raw(create_sql)
+    for table in ("lessees", "assets", "components"):
+        await service.db.execute_raw(f'ANALYZE "{table}"')
+
+
+async def _explain(service: OperationsService, sql: str, params: Tuple[str, ...]) -> str:
+    rows = await service.db.query_raw(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", *params)
+    return "\n".join(row["QUERY PLAN"] for row in rows)
+
+
+async def _explain_delete(service: OperationsService, sql: str, params: Tuple[str, ...]) -> str:
+    """EXPLAIN ANALYZE the row-by-row cascading delete, then roll it back"""
+    try:
+        async with service.db.tx() as tx:
+            rows = await tx.query_raw(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", *params)
+            raise _Rollback(rows)
+    except _Rollback as rollback:
+        return "\n".join(row["QUERY PLAN"] for row in rollback.args[0])
+
+
+async def _time_endpoint(service: OperationsService, month: str) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        # Bypass the month cache so every sample hits Postgres
+        await service._load_operations_by_month(month)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def _run(
+    service: OperationsService,
+    month: str,
+    label: str,
+    queries: Dict[str, str],
+    delete_sql: str,
+    query_params: QueryParams
+) -> float:
+    params = query_params(month)
+    print(f"\n===== {label} =====")
+    for name, sql in queries.items():
+        print(f"\n--- {name} ---\n{await _explain(service, sql, params)}")
+    print(f"\n--- cascading delete (rolled back) ---\n{await _explain_delete(service, delete_sql, params)}")
+
+    latency = await _time_endpoint(service, month)
+    print(f"\n⏱️  get_operations_by_month median: {latency:.1f} ms")
+    return latency
+
+
+async def run_index_benchmark(
+    indexes: Dict[str, str],
+    queries: Dict[str, str],
+    delete_sql: str,
+    query_params: QueryParams,
+    years: int = DEFAULT_YEARS,
+    lessees_per_month: int = DEFAULT_LESSEES_PER_MONTH
+) -> None:
+    """
+    Compare query plans and latency without and with indexes
+
+    The shipped indexes are dropped as well for the "before" run, so it
+    shows the tables with no secondary indexes at all.
+
+    Args:
+        indexes: Index name -> CREATE INDEX statement, for the indexes being measured
+        queries: Label -> SQL equivalent of what Prisma runs for an endpoint
+        delete_sql: Row-by-row cascading delete of one month
+        query_params: Parameters bound to queries and delete_sql for a month
+        years: Years of monthly data to seed
+        lessees_per_month: Lessees seeded per month
+    """
+    service = OperationsService()
+    await service.connect()
+    month = f"{SEED_PREFIX}{2020 + years - 1}-06"
+
+    try:
+        print(f"🌱 Seeding {years} years x {lessees_per_month} lessees x {ASSETS_PER_LESSEE} assets "
+              f"x {COMPONENTS_PER_ASSET} components...")
+        await _seed(service, years, lessees_per_month)
+
+        await _set_indexes(service, SHIPPED_INDEXES, present=False)
+        await _set_indexes(service, indexes, present=False)
+        before = await _run(service, month, "before (no indexes)", queries, delete_sql, query_params)
+
+        await _set_indexes(service, indexes, present=True)
+        after = await _run(service, month, "after (indexes)", queries, delete_sql, query_params)
+
+        print(f"\n📊 get_operations_by_month: {before:.1f} ms -> {after:.1f} ms")
+
+        start = time.perf_counter()
+        await service.delete_operations_by_month(month)
+        print(f"🗑️  delete_operations_by_month (partition drop): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    finally:
+        # Back to the shipped schema
+        await _set_indexes(service, indexes, present=False)
+        await _set_indexes(service, SHIPPED_INDEXES, present=True)
+        for seed_month in _seed_months(years):
+            await service.delete_operations_by_month(seed_month)
+        await service.disconnect()
+
+
+def cli_args() -> Dict[str, int]:
+    """years and lessees_per_month from argv"""
+    return {
+        "years": int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_YEARS,
+        "lessees_per_month": int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LESSEES_PER_MONTH,
+    }
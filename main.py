@@ -1,29 +1,69 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, File, UploadFile, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from pathlib import Path
 from datetime import datetime
 import tempfile
+import os
 import shutil
 import logging
+import asyncio
+import json
 import httpx
+import orjson
+from pydantic import ValidationError
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from src.utils.prompt.aircraft_prompt import build_aircraft_prompt
 from src.validators.aircraft_validator import validate_aircraft_utilization
-from src.services.aircraft_service import extract_aircraft_from_pdf
+from src.services.aircraft_service import (
+    extract_aircraft_from_pdf_async,
+    shutdown_render_executor
+)
 from src.services.operations_service import get_operations_service
+from src.services.cache_service import get_extraction_cache
+from src.services.extraction_trace import ExtractionTrace
+from src.services.job_service import get_job_service
+from src.services.llm_governor import get_llm_governor
+from src.services.http_clients import get_http_clients
+from src.services.render_pool import shutdown_render_pool
+from src.services.download_service import DownloadError, download_pdf
+from src.services.metrics import (
+    endpoint_context,
+    record_validation_warnings,
+    render_metrics,
+    set_endpoint,
+    track_extraction
+)
 from src.utils.reader.file_reader import validate_file_type
-from src.models.operation_models import SaveOperationsRequest, SaveOperationsResponse,ExtractFromUrlRequest
+from src.utils.reader.pdf_reader import PdfSource, file_has_pdf_header, has_pdf_header
+from src.utils.image.image_encoding import ImageEncodingPolicy
+from src.config.config import Config
+from src.models.operation_models import (
+    SaveOperationsRequest,
+    SaveOperationsResponse,
+    ExtractFromUrlRequest,
+    BatchExtractFromUrlRequest
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+async def _label_metrics_endpoint(request: Request) -> None:
+    """Label metrics recorded while handling a request with its route template"""
+    route = request.scope.get("route")
+    set_endpoint(getattr(route, "path", request.url.path))
+
+
 # Create FastAPI instance 
 app = FastAPI(
     title="Aircraft Utilization Data Extractor API",
     description="API for extracting PDF reports",
-    version="1.0.0"
+    version="1.0.0",
+    dependencies=[Depends(_label_metrics_endpoint)]
 )
 
 # CORS middleware
@@ -37,13 +77,19 @@ app.add_middleware(
 
 # Initialize services
 operations_service = get_operations_service()
+job_service = get_job_service()
+http_clients = get_http_clients()
 
 
 @app.on_event("startup")
 async def startup_event():
     """Connect to database on startup"""
     try:
+        # Fail fast on a bad IMAGE_FORMAT / IMAGE_* setting rather than on the first request
+        ImageEncodingPolicy.from_config()
         await operations_service.connect()
+        http_clients.start()
+        await job_service.start(runner=_run_extraction_job)
         logger.info("✅ Application started and database connected")
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
@@ -53,7 +99,11 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Disconnect from database on shutdown"""
+    await job_service.stop()
     await operations_service.disconnect()
+    await http_clients.close()
+    shutdown_render_executor()
+    shutdown_render_pool()
     logger.info("👋 Application shutdown and database disconnected")
 
 
@@ -77,6 +127,55 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: runs SELECT 1 against the database with a deadline"""
+    result = await operations_service.monitor.ping()
+    
+    return JSONResponse(
+        status_code=200 if result["ready"] else 503,
+        content={
+            "status": "ready" if result["ready"] else "unavailable",
+            "timestamp": datetime.now().isoformat(),
+            "database": result
+        }
+    )
+
+
+@app.get("/db/stats")
+async def db_stats():
+    """Database pool saturation, wait time and query latency percentiles"""
+    return await operations_service.monitor.stats()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: per-stage extraction latency, pages, payload, retries, warnings, in-flight work"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Extraction result and month data cache hit/miss counters"""
+    return {
+        "extraction": get_extraction_cache().stats(),
+        "operations_month": operations_service.month_cache.stats()
+    }
+
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """LLM governor queue depth, wait times and rate-limit counters"""
+    return get_llm_governor().stats()
+
+
+@app.get("/http/stats")
+async def http_stats():
+    """Connection pool hits, reuse rate and connect latency"""
+    return http_clients.stats()
+
+
 @app.post("/api/save-operations-data", response_model=SaveOperationsResponse)
 async def save_operations_data(request: SaveOperationsRequest):
     """
@@ -92,8 +191,10 @@ async def save_operations_data(request: SaveOperationsRequest):
         logger.info(f"📥 Received request to save data for month: {request.month}")
         logger.info(f"📊 Data contains {len(request.lessees)} lessees")
         
-        # Check if data already exists for this month
-        exists = await operations_service.check_month_exists(request.month)
+        upsert = request.mode == "upsert"
+        
+        # Check if data already exists for this month (upserts replace changed lessees instead)
+        exists = not upsert and await operations_service.check_month_exists(request.month)
         if exists:
             logger.warning(f"⚠️ Data already exists for month: {request.month}")
             return SaveOperationsResponse(
@@ -106,14 +207,15 @@ async def save_operations_data(request: SaveOperationsRequest):
         result = await operations_service.save_operations_data(
             lessees=request.lessees,
             month=request.month,
-            file_name=request.fileName
+            file_name=request.fileName,
+            upsert=upsert
         )
         
         if result["errors"]:
             logger.error(f"❌ Errors occurred: {result['errors']}")
             return SaveOperationsResponse(
                 success=False,
-                message="Some errors occurred during save",
+                message="Save failed, no data was written",
                 data={
                     "saved_lessees": result["saved_lessees"],
                     "saved_assets": result["saved_assets"],
@@ -132,6 +234,9 @@ async def save_operations_data(request: SaveOperationsRequest):
                 "saved_lessees": result["saved_lessees"],
                 "saved_assets": result["saved_assets"],
                 "saved_components": result["saved_components"],
+                "replaced_lessees": result["replaced_lessees"],
+                "unchanged_lessees": result["unchanged_lessees"],
+                "rows_per_second": result["rows_per_second"],
                 "month": request.month,
                 "file_name": request.fileName,
                 "saved_at": datetime.utcnow().isoformat()
@@ -157,69 +262,51 @@ async def extract_from_url(request: ExtractFromUrlRequest):
     Returns:
         JSON response with either existing airline data from database or message that airline not found
     """
-    temp_file_path = None
+    downloaded = None
+    trace = ExtractionTrace()
 
     try:
-        logger.info(f"📥 Downloading PDF from URL: {request.fileUrl}")
-        
-        # Download file from URL
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(request.fileUrl)
-            response.raise_for_status()
+        with track_extraction(trace):
+            logger.info(f"📥 Downloading PDF from URL: {request.fileUrl}")
             
-            # Save to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-                temp_file.write(response.content)
-                temp_file_path = temp_file.name
-        
-        
+            # Stream the file from URL (type and size are checked as it arrives)
+            with trace.stage("download"):
+                downloaded = await download_pdf(request.fileUrl)
 
-        # Validate file type
-        validate_file_type(temp_file_path)
+            # Build prompt
+            prompt = build_aircraft_prompt()
 
-        # Build prompt
-        prompt = build_aircraft_prompt()
+            
+            extracted_data = await extract_aircraft_from_pdf_async(
+                file_path=downloaded.source,
+                prompt=prompt,
+                dpi=150,
+                trace=trace,
+                file_hash=downloaded.sha256
+            )
+            logger.info(f"✅ Data extraction completed: {extracted_data}")
 
-        
-        extracted_data = extract_aircraft_from_pdf(
-            file_path=temp_file_path,
-            prompt=prompt,
-            dpi=150
-        )
-        logger.info(f"✅ Data extraction completed: {extracted_data}")
-
-        # Get the airline name from extracted data
-        airline_name = extracted_data.airline
-        
-
-        # Get all data from database
-        all_data = await operations_service.get_all_operations()
-
-        # Check if airline exists in the database (case-insensitive)
-        airline_data = None
-        if all_data:
-            for lessee in all_data:
-                db_name = lessee.get('name', '').casefold()
-                extracted_name = airline_name.casefold()
-                if db_name == extracted_name or lessee.get('lessee_name', '').casefold() == extracted_name:
-                    airline_data = lessee
-                    break
-
-            if airline_data:
-                
-                return JSONResponse(
-                    status_code=200,
-                    content={
-                        "success": True,
-                        "message": f"Airline '{airline_name}' already exists in database",
-                        "data_source": "database",
-                        "airline": airline_name,
-                        "data": airline_data,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                )
+            # Get the airline name from extracted data
+            airline_name = extracted_data.airline
+            
+
+            # Check if airline exists in the database (case-insensitive, indexed lookup)
+            with trace.stage("database"):
+                airline_data = await operations_service.find_lessee_by_name(airline_name)
 
+        if airline_data:
             
+            return JSONResponse(
+                status_code=200,
+                content={
+                    "success": True,
+                    "message": f"Airline '{airline_name}' already exists in database",
+                    "data_source": "database",
+                    "airline": airline_name,
+                    "data": airline_data,
+                    "timestamp": datetime.now().isoformat()
+                }
+            )
 
         
         return JSONResponse(
@@ -234,6 +321,13 @@ async def extract_from_url(request: ExtractFromUrlRequest):
             }
         )
         
+    except DownloadError as e:
+        logger.error(f"❌ Rejected download: {str(e)}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=f"Error downloading file from URL: {str(e)}"
+        )
+        
     except httpx.HTTPError as e:
         logger.error(f"❌ Error downloading file: {str(e)}")
         raise HTTPException(
@@ -249,13 +343,9 @@ async def extract_from_url(request: ExtractFromUrlRequest):
         )
         
     finally:
-        # Cleanup temporary file
-        if temp_file_path and Path(temp_file_path).exists():
-            try:
-                Path(temp_file_path).unlink()
-                logger.info("🧹 Cleaned up temporary file")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not delete temporary file: {e}")  
+        # Release the download buffer or temporary file
+        if downloaded is not None:
+            downloaded.close()
 
 
 @app.get("/api/operations-data/{month}")
@@ -275,21 +365,22 @@ async def get_operations_data(month: str):
         data = await operations_service.get_operations_by_month(month)
         
         if not data:
-            return {
+            return ORJSONResponse(content={
             "success": False,
             "data": [],
             "month": month,
             "count": 0
-            }
+            })
         
         logger.info(f"✅ Found {len(data)} lessees for month: {month}")
         
-        return {
+        # Already JSON-ready: skip jsonable_encoder and encode with orjson
+        return ORJSONResponse(content={
             "success": True,
             "data": data,
             "month": month,
             "count": len(data)
-        }
+        })
         
     except HTTPException:
         raise
@@ -302,25 +393,45 @@ async def get_operations_data(month: str):
 
 
 @app.get("/api/operations-data")
-async def get_all_operations_data():
+async def get_all_operations_data(
+    cursor: Optional[str] = None,
+    limit: int = Query(Config.OPERATIONS_PAGE_SIZE, ge=1, le=Config.OPERATIONS_MAX_PAGE_SIZE),
+    stream: bool = False
+):
     """
-    Retrieve all operations data
+    Retrieve operations data, one page at a time
     
+    Args:
+        cursor: next_cursor from the previous page (omit for the first page)
+        limit: Lessees per page
+        stream: Stream every lessee as NDJSON instead, fetching limit lessees at a time
+        
     Returns:
-        JSON response with all operations data
+        JSON response with one page of lessees and the cursor of the next page,
+        or an application/x-ndjson stream with one lessee per line
     """
+    if stream:
+        logger.info(f"📥 Streaming all operations data ({limit} lessees per query)")
+        
+        async def stream_lessees():
+            async for lessee in operations_service.iter_operations(page_size=limit):
+                yield orjson.dumps(lessee) + b"\n"
+        
+        return StreamingResponse(stream_lessees(), media_type="application/x-ndjson")
+    
     try:
-        logger.info("📥 Fetching all operations data")
+        logger.info(f"📥 Fetching operations data page (cursor={cursor}, limit={limit})")
         
-        data = await operations_service.get_all_operations()
+        data, next_cursor = await operations_service.get_operations_page(cursor, limit)
         
-        logger.info(f"✅ Found {len(data)} total lessees")
+        logger.info(f"✅ Found {len(data)} lessees")
         
-        return {
+        return ORJSONResponse(content={
             "success": True,
             "data": data,
-            "count": len(data)
-        }
+            "count": len(data),
+            "next_cursor": next_cursor
+        })
         
     except Exception as e:
         logger.error(f"💥 Error fetching all operations data: {str(e)}")
@@ -330,6 +441,68 @@ async def get_all_operations_data():
         )
 
 
+async def _aggregates_response(group_by: str, month: Optional[str]) -> Dict[str, Any]:
+    """Run an aggregate query and wrap it in the standard response"""
+    try:
+        logger.info(f"📊 Aggregating operations data by {group_by}" + (f" for {month}" if month else ""))
+        
+        rows = await operations_service.get_aggregates(group_by, month)
+        
+        return {
+            "success": True,
+            "group_by": group_by,
+            "month": month,
+            "data": rows,
+            "count": len(rows)
+        }
+        
+    except Exception as e:
+        logger.error(f"💥 Error aggregating operations data: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to aggregate operations data: {str(e)}"
+        )
+
+
+@app.get("/api/aggregates/months")
+async def get_monthly_aggregates():
+    """
+    Fleet utilization totals, averages and TSN/CSN ranges per month
+    
+    Returns:
+        JSON response with one row per month
+    """
+    return await _aggregates_response("month", None)
+
+
+@app.get("/api/aggregates/lessees")
+async def get_lessee_aggregates(month: Optional[str] = None):
+    """
+    Fleet utilization totals, averages and TSN/CSN ranges per lessee
+    
+    Args:
+        month: Optional month filter
+        
+    Returns:
+        JSON response with one row per lessee
+    """
+    return await _aggregates_response("lessee", month)
+
+
+@app.get("/api/aggregates/component-types")
+async def get_component_type_aggregates(month: Optional[str] = None):
+    """
+    Fleet utilization totals, averages and TSN/CSN ranges per component type
+    
+    Args:
+        month: Optional month filter
+        
+    Returns:
+        JSON response with one row per component type
+    """
+    return await _aggregates_response("component_type", month)
+
+
 @app.delete("/api/operations-data/{month}")
 async def delete_operations_data(month: str):
     """
@@ -370,6 +543,109 @@ async def delete_operations_data(month: str):
         )
 
 
+def _save_upload_to_tempfile(file: UploadFile) -> str:
+    """Copy an uploaded file to a temporary PDF file and return its path"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
+        try:
+            shutil.copyfileobj(file.file, temp_file)
+        except BaseException:
+            temp_file.close()
+            Path(temp_file.name).unlink(missing_ok=True)
+            raise
+        return temp_file.name
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file in bytes"""
+    if getattr(file, "size", None) is not None:
+        return file.size
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+def _cleanup_temp_file(temp_file_path: Optional[str]) -> None:
+    """Delete a temporary file if it still exists"""
+    if temp_file_path and Path(temp_file_path).exists():
+        try:
+            Path(temp_file_path).unlink()
+            logger.info("🧹 Cleaned up temporary file")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not delete temporary file: {e}")
+
+
+async def _extract_document(
+    source: PdfSource,
+    filename: str,
+    file_hash: Optional[str] = None,
+    trace: Optional[ExtractionTrace] = None
+) -> Dict[str, Any]:
+    """
+    Run the extraction pipeline on a PDF and build the response payload
+    
+    Args:
+        source: Path to the PDF file or its raw bytes
+        filename: Original file name reported back to the client
+        file_hash: SHA-256 of the file if already known (e.g. computed while downloading)
+        trace: ExtractionTrace to fill (e.g. one that already timed the download)
+        
+    Returns:
+        Response dict with extracted data, extraction trace and validation results
+    """
+    # Validate file type
+    if isinstance(source, str):
+        validate_file_type(source)
+        # The extension alone does not make it a PDF
+        is_pdf = await asyncio.to_thread(file_has_pdf_header, source)
+    else:
+        is_pdf = has_pdf_header(source)
+    if not is_pdf:
+        raise ValueError("Invalid file type: content is not a PDF")
+
+    # Build prompt
+    prompt = build_aircraft_prompt()
+
+    logger.info("🔄 Extracting data from PDF...")
+    trace = trace or ExtractionTrace()
+    extracted_data = await extract_aircraft_from_pdf_async(
+        file_path=source,
+        prompt=prompt,
+        dpi=150,
+        trace=trace,
+        file_hash=file_hash
+    )
+    logger.info("✅ Data extraction completed")
+
+    # Validate extracted data
+    with trace.stage("validation"):
+        is_valid, warnings = validate_aircraft_utilization(extracted_data)
+    record_validation_warnings(warnings, trace.model)
+
+    if not is_valid:
+        logger.warning(f"⚠️ Validation warnings: {len(warnings)}")
+    
+    return {
+        "success": True,
+        "message": "Data extracted successfully",
+        "filename": filename,
+        "extracted_data": extracted_data.model_dump(),
+        "extraction": trace.to_dict(),
+        "validation": {
+            "is_valid": is_valid,
+            "warnings": warnings
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+async def _run_extraction_job(file_path: str, filename: str) -> Dict[str, Any]:
+    """Job service runner: _extract_document with metrics labelled for /jobs"""
+    trace = ExtractionTrace()
+    with endpoint_context("/jobs"), track_extraction(trace):
+        return await _extract_document(file_path, filename, trace=trace)
+
+
 @app.post("/extract", response_model=Dict[str, Any])
 async def extract_aircraft_data(
     file: UploadFile = File(..., description="PDF file containing aircraft utilization report")
@@ -394,43 +670,16 @@ async def extract_aircraft_data(
             )
         logger.info(f"📂 Received file: {file.filename}")
 
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file_path = temp_file.name
-
-        # Validate file type
-        validate_file_type(temp_file_path)
-
-        # Build prompt
-        prompt = build_aircraft_prompt()
+        # Small uploads are opened straight from memory; large ones go through a temporary file
+        if await run_in_threadpool(_upload_size, file) <= Config.UPLOAD_SPOOL_MAX_BYTES:
+            source = await file.read()
+        else:
+            temp_file_path = await run_in_threadpool(_save_upload_to_tempfile, file)
+            source = temp_file_path
 
-        logger.info("🔄 Extracting data from PDF...")
-        extracted_data = extract_aircraft_from_pdf(
-            file_path=temp_file_path,
-            prompt=prompt,
-            dpi=150
-        )
-        logger.info("✅ Data extraction completed")
-
-        # Validate extracted data
-        is_valid, warnings = validate_aircraft_utilization(extracted_data)
-
-        if not is_valid:
-            logger.warning(f"⚠️ Validation warnings: {len(warnings)}")
-        
-        # Prepare response
-        response_data = {
-            "success": True,
-            "message": "Data extracted successfully",
-            "filename": file.filename,
-            "extracted_data": extracted_data.model_dump(),
-            "validation": {
-                "is_valid": is_valid,
-                "warnings": warnings
-            },
-            "timestamp": datetime.now().isoformat()
-        }
+        trace = ExtractionTrace()
+        with track_extraction(trace):
+            response_data = await _extract_document(source, file.filename, trace=trace)
         
         return JSONResponse(
             status_code=200,
@@ -449,12 +698,205 @@ async def extract_aircraft_data(
         
     finally:
         # Cleanup temporary file
-        if temp_file_path and Path(temp_file_path).exists():
-            try:
-                Path(temp_file_path).unlink()
-                logger.info("🧹 Cleaned up temporary file")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not delete temporary file: {e}")
+        _cleanup_temp_file(temp_file_path)
+
+
+
+@app.post("/jobs", status_code=202)
+async def submit_extraction_job(
+    file: UploadFile = File(..., description="PDF file containing aircraft utilization report")
+):
+    """
+    Queue an extraction and return immediately with a job id
+    
+    Args:
+        file: PDF file upload
+        
+    Returns:
+        JSON response with the job id and where to poll for its status
+    """
+    temp_file_path = None
+
+    try:
+        if not file.filename.lower().endswith(".pdf"):
+            raise HTTPException(
+                status_code=400,
+                detail="Only PDF files are supported."
+            )
+        logger.info(f"📂 Received file for background extraction: {file.filename}")
+
+        temp_file_path = await run_in_threadpool(_save_upload_to_tempfile, file)
+        # submit owns the file from here: it is moved into the job store or deleted
+        job = await job_service.submit(temp_file_path, file.filename)
+        temp_file_path = None
+
+        return {
+            "success": True,
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "status_url": f"/jobs/{job['job_id']}",
+            "queue_depth": job_service.queue_depth()
+        }
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"❌ Error queueing extraction job: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error queueing extraction job: {str(e)}"
+        )
+
+    finally:
+        _cleanup_temp_file(temp_file_path)
+
+
+@app.get("/jobs/{job_id}")
+async def get_extraction_job(job_id: str):
+    """
+    Retrieve status, per-stage timings and result of an extraction job
+    
+    Args:
+        job_id: Id returned by POST /jobs
+        
+    Returns:
+        JSON response with the job record
+    """
+    job = await job_service.get(job_id)
+    
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job not found: {job_id}"
+        )
+    
+    return job
+
+
+def _cleanup_batch_files(items: List[Dict[str, Optional[str]]]) -> None:
+    """Delete the spooled uploads of a batch (safe to call more than once)"""
+    for item in items:
+        _cleanup_temp_file(item["path"])
+
+
+async def _collect_batch_items(request: Request) -> List[Dict[str, Optional[str]]]:
+    """
+    Read a batch request into a list of documents to extract
+    
+    Multipart requests carry the PDFs as repeated "files" fields and are
+    spooled to temporary files up front; JSON requests carry a list of URLs.
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        uploads = form.getlist("files")
+        if not uploads:
+            raise HTTPException(status_code=400, detail="No files provided in 'files' field.")
+        if len(uploads) > Config.BATCH_MAX_DOCUMENTS:
+            raise HTTPException(status_code=400, detail=f"At most {Config.BATCH_MAX_DOCUMENTS} documents per batch.")
+        
+        items = []
+        try:
+            for upload in uploads:
+                if not upload.filename or not upload.filename.lower().endswith(".pdf"):
+                    items.append({"filename": upload.filename, "path": None, "url": None,
+                                  "error": "Only PDF files are supported."})
+                    continue
+                path = await run_in_threadpool(_save_upload_to_tempfile, upload)
+                items.append({"filename": upload.filename, "path": path, "url": None, "error": None})
+        except BaseException:
+            _cleanup_batch_files(items)
+            raise
+        return items
+    
+    try:
+        batch = BatchExtractFromUrlRequest.model_validate(await request.json())
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid batch request: {str(e)}")
+    
+    if len(batch.items) > Config.BATCH_MAX_DOCUMENTS:
+        raise HTTPException(status_code=400, detail=f"At most {Config.BATCH_MAX_DOCUMENTS} documents per batch.")
+    
+    return [
+        {"filename": item.fileName, "path": None, "url": item.fileUrl, "error": None}
+        for item in batch.items
+    ]
+
+
+@app.post("/extract/batch")
+async def extract_aircraft_data_batch(request: Request):
+    """
+    Extract aircraft utilization data from many PDFs in one request
+    
+    Accepts either multipart uploads (repeated "files" field) or a JSON body
+    {"items": [ExtractFromUrlRequest, ...]}. Documents are processed with at
+    most Config.BATCH_CONCURRENCY in flight, and each result is streamed
+    back as one NDJSON line as soon as it finishes.
+    
+    Returns:
+        application/x-ndjson stream, one object per document
+    """
+    items = await _collect_batch_items(request)
+    semaphore = asyncio.Semaphore(Config.BATCH_CONCURRENCY)
+    logger.info(f"📦 Batch extraction of {len(items)} documents (concurrency {Config.BATCH_CONCURRENCY})")
+    
+    async def process(index: int, item: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        temp_file_path = item["path"]
+        downloaded = None
+        try:
+            if item["error"]:
+                raise ValueError(item["error"])
+            
+            async with semaphore:
+                trace = ExtractionTrace()
+                with track_extraction(trace):
+                    if item["url"]:
+                        logger.info(f"📥 Downloading PDF from URL: {item['url']}")
+                        with trace.stage("download"):
+                            downloaded = await download_pdf(item["url"])
+                        result = await _extract_document(
+                            downloaded.source, item["filename"], downloaded.sha256, trace=trace
+                        )
+                    else:
+                        result = await _extract_document(temp_file_path, item["filename"], trace=trace)
+            
+            return {"index": index, **result}
+        
+        except Exception as e:
+            logger.error(f"❌ Batch item {index} ({item['filename']}) failed: {str(e)}")
+            return {
+                "index": index,
+                "success": False,
+                "filename": item["filename"],
+                "error": str(e),
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        finally:
+            _cleanup_temp_file(temp_file_path)
+            if downloaded is not None:
+                downloaded.close()
+    
+    async def stream_results():
+        tasks = [asyncio.create_task(process(index, item)) for index, item in enumerate(items)]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        finally:
+            # Client went away: stop the remaining documents
+            for task in tasks:
+                task.cancel()
+    
+    # Runs once the response is over, even if the client left before streaming started
+    # (the generator, and with it each item's own cleanup, never runs in that case)
+    return StreamingResponse(
+        stream_results(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(_cleanup_batch_files, items)
+    )
 
 
 if __name__ == "__main__":
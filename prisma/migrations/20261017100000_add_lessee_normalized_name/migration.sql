@@ -0,0 +1,8 @@
+-- AlterTable
+ALTER TABLE "lessees" ADD COLUMN "normalizedName" TEXT NOT NULL DEFAULT '';
+
+-- Backfill existing rows (the application writes name.strip().casefold())
+UPDATE "lessees" SET "normalizedName" = lower(btrim("name"));
+
+-- CreateIndex
+CREATE INDEX "lessees_normalizedName_idx" ON "lessees"("normalizedName");
@@ -0,0 +1,14 @@
+-- CreateIndex
+CREATE INDEX "lessees_month_idx" ON "lessees"("month");
+
+-- CreateIndex
+CREATE INDEX "assets_lesseeId_idx" ON "assets"("lesseeId");
+
+-- CreateIndex
+CREATE INDEX "assets_month_idx" ON "assets"("month");
+
+-- CreateIndex
+CREATE INDEX "components_assetId_idx" ON "components"("assetId");
+
+-- CreateIndex
+CREATE INDEX "components_month_idx" ON "components"("month");
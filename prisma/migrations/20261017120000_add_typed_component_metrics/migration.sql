@@ -0,0 +1,41 @@
+-- AlterTable
+ALTER TABLE "components" ADD COLUMN "flightHoursValue" DOUBLE PRECISION,
+ADD COLUMN "flightCyclesValue" DOUBLE PRECISION,
+ADD COLUMN "apuHoursValue" DOUBLE PRECISION,
+ADD COLUMN "apuCyclesValue" DOUBLE PRECISION,
+ADD COLUMN "tsnAtPeriodValue" DOUBLE PRECISION,
+ADD COLUMN "csnAtPeriodValue" DOUBLE PRECISION,
+ADD COLUMN "tsnAtPeriodEndValue" DOUBLE PRECISION,
+ADD COLUMN "csnAtPeriodEndValue" DOUBLE PRECISION;
+
+-- Backfill from the original string columns (same rules as src/utils/parser/metric_parser.py)
+CREATE FUNCTION "parse_metric"(raw TEXT) RETURNS DOUBLE PRECISION AS $$
+DECLARE
+    v TEXT := replace(btrim(coalesce(raw, '')), ' ', '');
+    hours DOUBLE PRECISION;
+BEGIN
+    IF v ~ '^-?[\d,]+:[0-5]?\d$' THEN
+        hours := replace(split_part(v, ':', 1), ',', '')::DOUBLE PRECISION;
+        IF v LIKE '-%' THEN
+            RETURN hours - split_part(v, ':', 2)::INTEGER / 60.0;
+        END IF;
+        RETURN hours + split_part(v, ':', 2)::INTEGER / 60.0;
+    END IF;
+    IF v ~ '^-?[\d,]*\.?\d+$' THEN
+        RETURN replace(v, ',', '')::DOUBLE PRECISION;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+UPDATE "components" SET
+    "flightHoursValue" = "parse_metric"("flightHours"),
+    "flightCyclesValue" = "parse_metric"("flightCycles"),
+    "apuHoursValue" = "parse_metric"("apuHours"),
+    "apuCyclesValue" = "parse_metric"("apuCycles"),
+    "tsnAtPeriodValue" = "parse_metric"("tsnAtPeriod"),
+    "csnAtPeriodValue" = "parse_metric"("csnAtPeriod"),
+    "tsnAtPeriodEndValue" = "parse_metric"("tsnAtPeriodEnd"),
+    "csnAtPeriodEndValue" = "parse_metric"("csnAtPeriodEnd");
+
+DROP FUNCTION "parse_metric"(TEXT);
@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "lessees" ADD COLUMN "contentHash" TEXT NOT NULL DEFAULT '';
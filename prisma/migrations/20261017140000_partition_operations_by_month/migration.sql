@@ -0,0 +1,217 @@
+-- Normalized month key, the partition key (same rules as src/utils/parser/month_key.py)
+CREATE FUNCTION "operations_month_key"(month TEXT) RETURNS TEXT AS $$
+DECLARE
+    v TEXT := lower(btrim(coalesce(month, ''), E' \t\r\n'));
+    names TEXT[] := ARRAY['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'];
+    m TEXT[];
+BEGIN
+    m := regexp_match(v, '^(\d{4})[-/. ](\d{1,2})$');
+    IF m IS NOT NULL AND m[2]::INTEGER BETWEEN 1 AND 12 THEN
+        RETURN m[1] || '-' || lpad(m[2], 2, '0');
+    END IF;
+    m := regexp_match(v, '^(\d{1,2})[-/. ](\d{4})$');
+    IF m IS NOT NULL AND m[1]::INTEGER BETWEEN 1 AND 12 THEN
+        RETURN m[2] || '-' || lpad(m[1], 2, '0');
+    END IF;
+    m := regexp_match(v, '^([a-z]{3})[a-z]*\.?[-/, ]*(\d{4})$');
+    IF m IS NOT NULL AND array_position(names, m[1]) IS NOT NULL THEN
+        RETURN m[2] || '-' || lpad(array_position(names, m[1])::TEXT, 2, '0');
+    END IF;
+    RETURN regexp_replace(v, '[^a-z0-9]+', '_', 'g');
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Partition table suffix for a month key ("2024-01" -> "2024_01", anything else hashed)
+CREATE FUNCTION "operations_partition_suffix"(key TEXT) RETURNS TEXT AS $$
+    SELECT CASE WHEN key ~ '^\d{4}-\d{2}$' THEN replace(key, '-', '_') ELSE 'x' || left(md5(key), 12) END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Create the lessees/assets/components partitions for a month key if missing
+CREATE FUNCTION "ensure_month_partitions"(key TEXT) RETURNS VOID AS $$
+DECLARE
+    suffix TEXT := "operations_partition_suffix"(key);
+    parent TEXT;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['lessees', 'assets', 'components'] LOOP
+        IF to_regclass(format('%I', parent || '_' || suffix)) IS NULL THEN
+            EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (%L)',
+                           parent || '_' || suffix, parent, key);
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Detach and drop a month's partitions; children first so no foreign key still points into them
+CREATE FUNCTION "drop_month_partitions"(key TEXT) RETURNS BOOLEAN AS $$
+DECLARE
+    suffix TEXT := "operations_partition_suffix"(key);
+    parent TEXT;
+    dropped BOOLEAN := FALSE;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['components', 'assets', 'lessees'] LOOP
+        IF to_regclass(format('%I', parent || '_' || suffix)) IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, parent || '_' || suffix);
+            EXECUTE format('DROP TABLE %I', parent || '_' || suffix);
+            dropped := TRUE;
+        END IF;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move the unpartitioned tables aside
+ALTER TABLE "components" DROP CONSTRAINT "components_assetId_fkey";
+ALTER TABLE "assets" DROP CONSTRAINT "assets_lesseeId_fkey";
+
+ALTER TABLE "lessees" DROP CONSTRAINT "lessees_pkey";
+DROP INDEX "lessees_name_month_key";
+DROP INDEX "lessees_normalizedName_idx";
+DROP INDEX "lessees_month_idx";
+ALTER TABLE "lessees" RENAME TO "lessees_legacy";
+
+ALTER TABLE "assets" DROP CONSTRAINT "assets_pkey";
+DROP INDEX "assets_lesseeId_idx";
+DROP INDEX "assets_month_idx";
+ALTER TABLE "assets" RENAME TO "assets_legacy";
+
+ALTER TABLE "components" DROP CONSTRAINT "components_pkey";
+DROP INDEX "components_assetId_idx";
+DROP INDEX "components_month_idx";
+ALTER TABLE "components" RENAME TO "components_legacy";
+
+-- CreateTable
+CREATE TABLE "lessees" (
+    "id" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+    "normalizedName" TEXT NOT NULL DEFAULT '',
+    "contentHash" TEXT NOT NULL DEFAULT '',
+    "month" TEXT NOT NULL,
+    "monthKey" TEXT NOT NULL,
+    "fileName" TEXT NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "lessees_pkey" PRIMARY KEY ("id","monthKey")
+) PARTITION BY LIST ("monthKey");
+
+-- CreateTable
+CREATE TABLE "assets" (
+    "id" TEXT NOT NULL,
+    "name" TEXT NOT NULL,
+    "serialNumber" TEXT NOT NULL,
+    "registrationNumber" TEXT NOT NULL,
+    "validation_status" TEXT NOT NULL,
+    "report_status" TEXT NOT NULL,
+    "obligation_status" TEXT NOT NULL,
+    "month" TEXT NOT NULL,
+    "monthKey" TEXT NOT NULL,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "lesseeId" TEXT NOT NULL,
+
+    CONSTRAINT "assets_pkey" PRIMARY KEY ("id","monthKey")
+) PARTITION BY LIST ("monthKey");
+
+-- CreateTable
+CREATE TABLE "components" (
+    "id" TEXT NOT NULL,
+    "type" TEXT NOT NULL,
+    "serialNumber" TEXT NOT NULL,
+    "lastUtilizationDate" TEXT NOT NULL,
+    "flightHours" TEXT NOT NULL,
+    "flightCycles" TEXT NOT NULL,
+    "apuHours" TEXT NOT NULL,
+    "apuCycles" TEXT NOT NULL,
+    "tsnAtPeriod" TEXT NOT NULL,
+    "csnAtPeriod" TEXT NOT NULL,
+    "tsnAtPeriodEnd" TEXT NOT NULL,
+    "csnAtPeriodEnd" TEXT NOT NULL,
+    "lastTsnCsnUpdate" TEXT NOT NULL,
+    "lastTsnUtilization" TEXT NOT NULL,
+    "lastCsnUtilization" TEXT NOT NULL,
+    "attachmentStatus" TEXT NOT NULL,
+    "engineThrust" TEXT NOT NULL,
+    "status" TEXT NOT NULL,
+    "utilReportStatus" TEXT NOT NULL,
+    "asset_status" TEXT NOT NULL,
+    "derate" TEXT NOT NULL,
+    "month" TEXT NOT NULL,
+    "monthKey" TEXT NOT NULL,
+    "flightHoursValue" DOUBLE PRECISION,
+    "flightCyclesValue" DOUBLE PRECISION,
+    "apuHoursValue" DOUBLE PRECISION,
+    "apuCyclesValue" DOUBLE PRECISION,
+    "tsnAtPeriodValue" DOUBLE PRECISION,
+    "csnAtPeriodValue" DOUBLE PRECISION,
+    "tsnAtPeriodEndValue" DOUBLE PRECISION,
+    "csnAtPeriodEndValue" DOUBLE PRECISION,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "assetId" TEXT NOT NULL,
+
+    CONSTRAINT "components_pkey" PRIMARY KEY ("id","monthKey")
+) PARTITION BY LIST ("monthKey");
+
+-- Catch-all partitions (the application creates a partition before writing a new month)
+CREATE TABLE "lessees_default" PARTITION OF "lessees" DEFAULT;
+CREATE TABLE "assets_default" PARTITION OF "assets" DEFAULT;
+CREATE TABLE "components_default" PARTITION OF "components" DEFAULT;
+
+-- CreateIndex
+CREATE UNIQUE INDEX "lessees_name_month_monthKey_key" ON "lessees"("name", "month", "monthKey");
+
+-- CreateIndex
+CREATE INDEX "lessees_normalizedName_idx" ON "lessees"("normalizedName");
+
+-- CreateIndex
+CREATE INDEX "assets_lesseeId_monthKey_idx" ON "assets"("lesseeId", "monthKey");
+
+-- CreateIndex
+CREATE INDEX "components_assetId_monthKey_idx" ON "components"("assetId", "monthKey");
+
+-- AddForeignKey
+ALTER TABLE "assets" ADD CONSTRAINT "assets_lesseeId_monthKey_fkey" FOREIGN KEY ("lesseeId", "monthKey") REFERENCES "lessees"("id", "monthKey") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "components" ADD CONSTRAINT "components_assetId_monthKey_fkey" FOREIGN KEY ("assetId", "monthKey") REFERENCES "assets"("id", "monthKey") ON DELETE CASCADE ON UPDATE CASCADE;
+
+-- Copy existing data into per-month partitions (children take their lessee's key)
+SELECT "ensure_month_partitions"(k.key)
+FROM (SELECT DISTINCT "operations_month_key"("month") AS key FROM "lessees_legacy") k;
+
+INSERT INTO "lessees" ("id", "name", "normalizedName", "contentHash", "month", "monthKey", "fileName", "createdAt", "updatedAt")
+SELECT "id", "name", "normalizedName", "contentHash", "month", "operations_month_key"("month"), "fileName", "createdAt", "updatedAt"
+FROM "lessees_legacy";
+
+INSERT INTO "assets" ("id", "name", "serialNumber", "registrationNumber", "validation_status", "report_status",
+                      "obligation_status", "month", "monthKey", "createdAt", "lesseeId")
+SELECT a."id", a."name", a."serialNumber", a."registrationNumber", a."validation_status", a."report_status",
+       a."obligation_status", a."month", "operations_month_key"(l."month"), a."createdAt", a."lesseeId"
+FROM "assets_legacy" a
+JOIN "lessees_legacy" l ON l."id" = a."lesseeId";
+
+INSERT INTO "components" ("id", "type", "serialNumber", "lastUtilizationDate", "flightHours", "flightCycles",
+                          "apuHours", "apuCycles", "tsnAtPeriod", "csnAtPeriod", "tsnAtPeriodEnd", "csnAtPeriodEnd",
+                          "lastTsnCsnUpdate", "lastTsnUtilization", "lastCsnUtilization", "attachmentStatus",
+                          "engineThrust", "status", "utilReportStatus", "asset_status", "derate", "month", "monthKey",
+                          "flightHoursValue", "flightCyclesValue", "apuHoursValue", "apuCyclesValue",
+                          "tsnAtPeriodValue", "csnAtPeriodValue", "tsnAtPeriodEndValue", "csnAtPeriodEndValue",
+                          "createdAt", "assetId")
+SELECT c."id", c."type", c."serialNumber", c."lastUtilizationDate", c."flightHours", c."flightCycles",
+       c."apuHours", c."apuCycles", c."tsnAtPeriod", c."csnAtPeriod", c."tsnAtPeriodEnd", c."csnAtPeriodEnd",
+       c."lastTsnCsnUpdate", c."lastTsnUtilization", c."lastCsnUtilization", c."attachmentStatus",
+       c."engineThrust", c."status", c."utilReportStatus", c."asset_status", c."derate", c."month",
+       "operations_month_key"(l."month"),
+       c."flightHoursValue", c."flightCyclesValue", c."apuHoursValue", c."apuCyclesValue",
+       c."tsnAtPeriodValue", c."csnAtPeriodValue", c."tsnAtPeriodEndValue", c."csnAtPeriodEndValue",
+       c."createdAt", c."assetId"
+FROM "components_legacy" c
+JOIN "assets_legacy" a ON a."id" = c."assetId"
+JOIN "lessees_legacy" l ON l."id" = a."lesseeId";
+
+-- DropTable
+DROP TABLE "components_legacy";
+DROP TABLE "assets_legacy";
+DROP TABLE "lessees_legacy";
+
+ANALYZE "lessees";
+ANALYZE "assets";
+ANALYZE "components";
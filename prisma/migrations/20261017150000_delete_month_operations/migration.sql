@@ -0,0 +1,56 @@
+-- Detach and drop a month's partitions; children first so no foreign key still points into them.
+-- Callers hold the month key's advisory lock (see delete_month_operations).
+CREATE OR REPLACE FUNCTION "drop_month_partitions"(key TEXT) RETURNS BOOLEAN AS $$
+DECLARE
+    suffix TEXT := "operations_partition_suffix"(key);
+    parent TEXT;
+    dropped BOOLEAN := FALSE;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(key));
+    FOREACH parent IN ARRAY ARRAY['components', 'assets', 'lessees'] LOOP
+        IF to_regclass(format('%I', parent || '_' || suffix)) IS NOT NULL THEN
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, parent || '_' || suffix);
+            EXECUTE format('DROP TABLE %I', parent || '_' || suffix);
+            dropped := TRUE;
+        END IF;
+    END LOOP;
+    RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Delete one spelling of a month in a single transaction under the month key's advisory lock
+-- (the lock saves take), so no save can add rows to the partitions between the check and the drop.
+-- Partitions owned by this spelling alone are detached and dropped; detaching needs an ACCESS
+-- EXCLUSIVE lock on the parents, so it gives up after lock_timeout_ms rather than queueing reads
+-- behind it, and the rows are deleted instead. Returns 'dropped', 'deleted' or 'missing'.
+CREATE FUNCTION "delete_month_operations"(key TEXT, month TEXT, lock_timeout_ms INTEGER) RETURNS TEXT AS $$
+DECLARE
+    found BOOLEAN;
+    shared BOOLEAN;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(key));
+
+    SELECT EXISTS (SELECT 1 FROM "lessees" l WHERE l."monthKey" = key AND l."month" = $2),
+           EXISTS (SELECT 1 FROM "lessees" l WHERE l."monthKey" = key AND l."month" <> $2)
+    INTO found, shared;
+
+    IF NOT found THEN
+        RETURN 'missing';
+    END IF;
+
+    IF NOT shared THEN
+        BEGIN
+            -- Local to this block: rolled back with it if the lock is not granted in time
+            PERFORM set_config('lock_timeout', lock_timeout_ms || 'ms', true);
+            PERFORM "drop_month_partitions"(key);
+            RETURN 'dropped';
+        EXCEPTION WHEN lock_not_available THEN
+            RAISE NOTICE 'partitions for % are busy, deleting rows instead', key;
+        END;
+    END IF;
+
+    -- Cascades to the month's assets and components
+    DELETE FROM "lessees" l WHERE l."monthKey" = key AND l."month" = $2;
+    RETURN 'deleted';
+END;
+$$ LANGUAGE plpgsql;
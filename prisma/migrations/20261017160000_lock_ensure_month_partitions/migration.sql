@@ -0,0 +1,21 @@
+-- Create the lessees/assets/components partitions for a month key if missing.
+-- Takes the month key's advisory lock (the one saves and deletes take) so concurrent first saves
+-- of a new month create the partitions once; duplicate_table covers sessions that skip the lock.
+CREATE OR REPLACE FUNCTION "ensure_month_partitions"(key TEXT) RETURNS VOID AS $$
+DECLARE
+    suffix TEXT := "operations_partition_suffix"(key);
+    parent TEXT;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext(key));
+    FOREACH parent IN ARRAY ARRAY['lessees', 'assets', 'components'] LOOP
+        IF to_regclass(format('%I', parent || '_' || suffix)) IS NULL THEN
+            BEGIN
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES IN (%L)',
+                               parent || '_' || suffix, parent, key);
+            EXCEPTION WHEN duplicate_table THEN
+                NULL;
+            END;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
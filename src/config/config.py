@@ -10,9 +10,66 @@ class Config:
     MODEL = os.getenv("MODEL", "openai/gpt-4o")
     IMAGE_MODEL = os.getenv("IMAGE_MODEL", "openai/gpt-4o")
     VISION_MODEL = "openai/gpt-4o"
-    TEXT_MODEL = os.getenv("TEXT_MODEL", "gpt-4o-mini")
+    TEXT_MODEL = os.getenv("TEXT_MODEL", "openai/gpt-4o-mini")
     TEMPERATURE = float(os.getenv("TEMPERATURE", 0.0))
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", 3))
+    RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+    PARALLEL_RENDER = os.getenv("PARALLEL_RENDER", "false").lower() == "true"
+    RENDER_PROCESSES = int(os.getenv("RENDER_PROCESSES", os.cpu_count() or 1))
+    IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "auto")
+    IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", 85))
+    IMAGE_GRAYSCALE = os.getenv("IMAGE_GRAYSCALE", "true").lower() == "true"
+    IMAGE_DOWNSCALE = os.getenv("IMAGE_DOWNSCALE", "true").lower() == "true"
+    IMAGE_MAX_SIDE = int(os.getenv("IMAGE_MAX_SIDE", 0))
+    TEXT_FAST_PATH = os.getenv("TEXT_FAST_PATH", "true").lower() == "true"
+    TEXT_LAYER_MIN_CHARS = int(os.getenv("TEXT_LAYER_MIN_CHARS", 200))
+    PAGE_FILTER = os.getenv("PAGE_FILTER", "true").lower() == "true"
+    PAGE_RELEVANCE_MIN_SCORE = int(os.getenv("PAGE_RELEVANCE_MIN_SCORE", 3))
+    PAGE_MIN_INK_RATIO = float(os.getenv("PAGE_MIN_INK_RATIO", 0.02))
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+    BATCH_MAX_DOCUMENTS = int(os.getenv("BATCH_MAX_DOCUMENTS", 500))
+    JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", ".jobs/jobs.db")
+    JOBS_DIR = os.getenv("JOBS_DIR", ".jobs/files")
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", 60))
+    LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", 200000))
+    LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", 8))
+    LLM_RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", 5))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 2.0))
+    LLM_IMAGE_TOKEN_ESTIMATE = int(os.getenv("LLM_IMAGE_TOKEN_ESTIMATE", 1105))
+    LLM_OUTPUT_TOKEN_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKEN_ESTIMATE", 1000))
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 10.0))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 60.0))
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 120.0))
+    LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", 20))
+    LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", 10))
+    DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("DOWNLOAD_TIMEOUT_SECONDS", 30.0))
+    DOWNLOAD_POOL_MAX_CONNECTIONS = int(os.getenv("DOWNLOAD_POOL_MAX_CONNECTIONS", 20))
+    DOWNLOAD_POOL_MAX_KEEPALIVE = int(os.getenv("DOWNLOAD_POOL_MAX_KEEPALIVE", 10))
+    DOWNLOAD_MAX_BYTES = int(os.getenv("DOWNLOAD_MAX_BYTES", 100 * 1024 * 1024))
+    DOWNLOAD_SPOOL_MAX_BYTES = int(os.getenv("DOWNLOAD_SPOOL_MAX_BYTES", 16 * 1024 * 1024))
+    DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", 64 * 1024))
+    UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", 16 * 1024 * 1024))
+    DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", 1000))
+    DB_TX_TIMEOUT_SECONDS = float(os.getenv("DB_TX_TIMEOUT_SECONDS", 60))
+    DB_PARTITION_LOCK_TIMEOUT_MS = int(os.getenv("DB_PARTITION_LOCK_TIMEOUT_MS", 2000))
+    OPERATIONS_PAGE_SIZE = int(os.getenv("OPERATIONS_PAGE_SIZE", 100))
+    OPERATIONS_MAX_PAGE_SIZE = int(os.getenv("OPERATIONS_MAX_PAGE_SIZE", 1000))
+    MONTH_CACHE_ENABLED = os.getenv("MONTH_CACHE_ENABLED", "true").lower() == "true"
+    MONTH_CACHE_MAX_ENTRIES = int(os.getenv("MONTH_CACHE_MAX_ENTRIES", 64))
+    MONTH_CACHE_TTL_SECONDS = float(os.getenv("MONTH_CACHE_TTL_SECONDS", 300))
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    DB_CONNECTION_LIMIT = int(os.getenv("DB_CONNECTION_LIMIT", 10))
+    DB_POOL_TIMEOUT_SECONDS = int(os.getenv("DB_POOL_TIMEOUT_SECONDS", 10))
+    DB_CONNECT_TIMEOUT_SECONDS = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", 5))
+    DB_READY_TIMEOUT_SECONDS = float(os.getenv("DB_READY_TIMEOUT_SECONDS", 2.0))
+    CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_DIR = os.getenv("CACHE_DIR", ".cache/extractions")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 256))
+    CACHE_MAX_DISK_MB = int(os.getenv("CACHE_MAX_DISK_MB", 200))
 
     if not OPENROUTER_API_KEY:
         raise ValueError("OPENROUTER_API_KEY is not set in .env")
\ No newline at end of file
@@ -0,0 +1,19 @@
+import asyncio
+from src.services.operations_service import get_operations_service
+
+
+async def main():
+    print("🔤 Recomputing lessee normalizedName from Python")
+    print("=" * 50)
+    
+    operations_service = get_operations_service()
+    try:
+        await operations_service.connect()
+        updated = await operations_service.backfill_normalized_names()
+        print(f"✅ Updated {updated} lessees")
+    finally:
+        await operations_service.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional,List
+from typing import Optional,List,Literal
 
 class ComponentData(BaseModel):
     type: str
@@ -43,6 +43,8 @@ class SaveOperationsRequest(BaseModel):
     lessees: List[LesseeData]
     month: str
     fileName: str
+    # "upsert" replaces only changed lessees instead of rejecting an existing month
+    mode: Literal["insert", "upsert"] = "insert"
 
 
 class SaveOperationsResponse(BaseModel):
@@ -55,3 +57,7 @@ class ExtractFromUrlRequest(BaseModel):
     fileUrl: str
     fileName: str
     month: str
+
+
+class BatchExtractFromUrlRequest(BaseModel):
+    items: List[ExtractFromUrlRequest]
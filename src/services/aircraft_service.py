@@ -1,27 +1,104 @@
-import instructor
-from openai import OpenAI
 import fitz  
-import base64
-import io
-from typing import List, Dict, Any
-from PIL import Image, ImageEnhance, ImageFilter
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+from PIL import Image, ImageFilter
 import logging
 
 from src.config.config import Config
 from src.models.aircraft_models import AircraftUtilization
+from src.services.cache_service import get_extraction_cache, hash_bytes, hash_file
+from src.services.extraction_trace import ExtractionTrace, maybe_stage
+from src.services.http_clients import get_http_clients
+from src.services.llm_governor import (
+    estimate_request_tokens,
+    get_llm_governor,
+    instructor_async_retrying,
+    instructor_retrying
+)
+from src.services.metrics import record_validation_warnings
+from src.services.render_pool import render_pages_parallel
+from src.utils.image.image_encoding import ImageEncodingPolicy, encode_image
+from src.utils.reader.page_relevance import select_relevant_pages
+from src.utils.reader.pdf_reader import PdfInput, PdfSource, describe_source, open_pdf, read_pdf_source
+from src.validators.aircraft_validator import validate_aircraft_utilization
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-base_client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=Config.OPENROUTER_API_KEY
+# Bounded pool for CPU-heavy rendering so it never runs on the event loop
+_render_executor = ThreadPoolExecutor(
+    max_workers=Config.RENDER_WORKERS,
+    thread_name_prefix="pdf-render"
 )
-client = instructor.from_openai(base_client)
+
+SYSTEM_PROMPT = "You are an AI that extracts structured aircraft utilization data from maintenance report images. Carefully analyze all visual elements including text, tables, charts, stamps, and handwritten notes. Extract all information accurately according to the schema provided."
+
+TEXT_SYSTEM_PROMPT = "You are an AI that extracts structured aircraft utilization data from the text layer of maintenance reports. Tables are given as markdown and the remaining page text in reading order. Extract all information accurately according to the schema provided."
+
+
+def iter_pdf_images(
+    pdf_path: PdfSource,
+    dpi: int = 450,
+    parallel: Optional[bool] = None,
+    pages: Optional[Sequence[int]] = None,
+    trace: Optional[ExtractionTrace] = None
+) -> Iterator[Image.Image]:
+    """
+    Render PDF pages one at a time as optimized images for vision LLM
+    
+    Pixmaps are wrapped directly from their raw samples instead of being
+    encoded to PNG and decoded again, and only the current page is held
+    in memory.
+    
+    Args:
+        pdf_path: Path to the PDF file or its raw bytes
+        dpi: Resolution (450 recommended for aircraft data precision)
+        parallel: Rasterize on the shared process pool (defaults to Config.PARALLEL_RENDER)
+        pages: Zero-based page numbers to render (defaults to every page)
+        trace: Optional ExtractionTrace to time rasterizing and OCR optimization in
+        
+    Yields:
+        Optimized PIL Image objects in page order
+    """
+    if parallel is None:
+        parallel = Config.PARALLEL_RENDER
+    
+    with open_pdf(pdf_path) as doc:
+        page_numbers = list(pages) if pages is not None else list(range(len(doc)))
+        
+        if not parallel or len(page_numbers) < 2 or Config.RENDER_PROCESSES < 2:
+            mat = fitz.Matrix(dpi / 72, dpi / 72)
+            
+            for page_num in page_numbers:
+                with maybe_stage(trace, "rasterize"):
+                    page = doc.load_page(page_num)
+                    pix = page.get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csRGB)
+                    
+                    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+                    del pix
+                
+                with maybe_stage(trace, "ocr_optimize"):
+                    img = _optimize_image_for_ocr(img)
+                yield img
+            return
+    
+    rendered = render_pages_parallel(pdf_path, dpi, page_numbers)
+    while True:
+        # Time spent waiting on the process pool counts as rasterizing
+        with maybe_stage(trace, "rasterize"):
+            page_pixels = next(rendered, None)
+        if page_pixels is None:
+            return
+        
+        width, height, samples = page_pixels
+        with maybe_stage(trace, "ocr_optimize"):
+            img = _optimize_image_for_ocr(Image.frombytes("RGB", (width, height), samples))
+        yield img
 
 
-def pdf_to_images(pdf_path: str, dpi: int = 450) -> List[Image.Image]:
+def pdf_to_images(pdf_path: PdfSource, dpi: int = 450) -> List[Image.Image]:
     """
     Convert PDF pages to optimized images for vision LLM
     
@@ -33,25 +110,7 @@ def pdf_to_images(pdf_path: str, dpi: int = 450) -> List[Image.Image]:
         List of optimized PIL Image objects
     """
     try:
-        doc = fitz.open(pdf_path)
-        images = []
-        
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            
-            
-            mat = fitz.Matrix(dpi / 72, dpi / 72)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            
-            
-            img_data = pix.tobytes("png")
-            img = Image.open(io.BytesIO(img_data))
-            
-            
-            img = _optimize_image_for_ocr(img)
-            images.append(img)
-        
-        doc.close()
+        images = list(iter_pdf_images(pdf_path, dpi=dpi))
         logger.info(f"✅ Converted PDF to {len(images)} optimized images at {dpi} DPI")
         return images
         
@@ -60,120 +119,515 @@ def pdf_to_images(pdf_path: str, dpi: int = 450) -> List[Image.Image]:
         return []
 
 
+# OCR enhancement settings (applied by _optimize_image_for_ocr)
+OCR_CONTRAST = 1.2
+OCR_SHARPNESS = 1.3
+OCR_UNSHARP_PERCENT = 120
+OCR_BRIGHTNESS = 1.05
+
+
+def _convolve_kernels(a: List[List[float]], b: List[List[float]]) -> List[List[float]]:
+    """Full 2D convolution of two small square kernels"""
+    size = len(a) + len(b) - 1
+    out = [[0.0] * size for _ in range(size)]
+    
+    for i, row_a in enumerate(a):
+        for j, value_a in enumerate(row_a):
+            for k, row_b in enumerate(b):
+                for m, value_b in enumerate(row_b):
+                    out[i + k][j + m] += value_a * value_b
+    
+    return out
+
+
+def _build_sharpen_kernel() -> List[float]:
+    """
+    Fold ImageEnhance.Sharpness and UnsharpMask(radius=1) into one 5x5 kernel
+    
+    Sharpness blends the image with PIL's SMOOTH filter and UnsharpMask
+    blends it with a Gaussian blur; both are linear, so their composition
+    is a single convolution.
+    """
+    smooth = [[v / 13 for v in row] for row in ([1, 1, 1], [1, 5, 1], [1, 1, 1])]
+    gauss_1d = [0.27406862, 0.45186276, 0.27406862]
+    gauss = [[x * y for y in gauss_1d] for x in gauss_1d]
+    
+    sharpness = [
+        [(OCR_SHARPNESS if (i, j) == (1, 1) else 0.0) - (OCR_SHARPNESS - 1) * smooth[i][j] for j in range(3)]
+        for i in range(3)
+    ]
+    amount = OCR_UNSHARP_PERCENT / 100
+    unsharp = [
+        [((1 + amount) if (i, j) == (1, 1) else 0.0) - amount * gauss[i][j] for j in range(3)]
+        for i in range(3)
+    ]
+    
+    return [value for row in _convolve_kernels(sharpness, unsharp) for value in row]
+
+
+_OCR_SHARPEN_FILTER = ImageFilter.Kernel((5, 5), _build_sharpen_kernel(), scale=1)
+
+
+def _build_tone_lut(image: Image.Image) -> List[int]:
+    """
+    Fold the contrast and brightness point operations into one lookup table
+    
+    Contrast pivots around the mean luminance, exactly like ImageEnhance.Contrast;
+    the mean is taken from the RGB histogram so no grayscale copy is made.
+    """
+    histogram = image.histogram()
+    total = image.width * image.height
+    band_means = [
+        sum(i * count for i, count in enumerate(histogram[band * 256:(band + 1) * 256])) / total
+        for band in range(3)
+    ]
+    mean = int((0.299 * band_means[0] + 0.587 * band_means[1] + 0.114 * band_means[2]) + 0.5)
+    
+    lut = []
+    for value in range(256):
+        contrasted = min(255, max(0, round(mean + OCR_CONTRAST * (value - mean))))
+        lut.append(min(255, round(contrasted * OCR_BRIGHTNESS)))
+    
+    return lut * 3
+
+
 def _optimize_image_for_ocr(image: Image.Image) -> Image.Image:
     """
     Optimize image for better OCR accuracy
     Critical for accurate extraction of decimal values in aircraft data
+    
+    Equivalent to Contrast -> Sharpness -> UnsharpMask -> Brightness, done
+    in two passes: one tone lookup table and one fused sharpening kernel.
     """
     try:
         
         if image.mode != 'RGB':
             image = image.convert('RGB')
         
+        image = image.point(_build_tone_lut(image))
         
-        contrast_enhancer = ImageEnhance.Contrast(image)
-        image = contrast_enhancer.enhance(1.2)
-        
-        
-        sharpness_enhancer = ImageEnhance.Sharpness(image)
-        image = sharpness_enhancer.enhance(1.3)
-        
-        
-        image = image.filter(ImageFilter.UnsharpMask(radius=1, percent=120, threshold=2))
-        
-        
-        brightness_enhancer = ImageEnhance.Brightness(image)
-        image = brightness_enhancer.enhance(1.05)
-        
-        return image
+        return image.filter(_OCR_SHARPEN_FILTER)
         
     except Exception as e:
         logger.warning(f"⚠️ Error optimizing image: {e}, returning original")
         return image
 
 
-def image_to_base64(image: Image.Image) -> str:
-    """Convert PIL Image to base64 string"""
+def image_to_base64(image: Image.Image, policy: Optional[ImageEncodingPolicy] = None) -> str:
+    """Convert PIL Image to a base64 data URL using the encoding policy"""
     try:
-        buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
-        return f"data:image/png;base64,{image_base64}"
+        return encode_image(image, policy).data_url
         
     except Exception as e:
         logger.error(f"❌ Error converting image to base64: {e}")
         return None
 
 
-def prepare_image_content(images: List[Image.Image]) -> List[Dict[str, Any]]:
-    """Prepare images in format required by Vision LLM API"""
+def prepare_image_content(
+    images: Iterable[Image.Image],
+    policy: Optional[ImageEncodingPolicy] = None,
+    trace: Optional[ExtractionTrace] = None
+) -> List[Dict[str, Any]]:
+    """Prepare images in format required by Vision LLM API (accepts a page generator)"""
+    policy = policy or ImageEncodingPolicy.from_config()
     image_content = []
+    total_bytes = 0
+    total_tokens = 0
+    
+    for page_num, image in enumerate(images, 1):
+        try:
+            with maybe_stage(trace, "encode"):
+                encoded = encode_image(image, policy)
+        except Exception as e:
+            logger.error(f"❌ Error converting image to base64: {e}")
+            continue
+        
+        total_bytes += encoded.num_bytes
+        total_tokens += encoded.estimated_tokens
+        logger.info(
+            f"🖼️ Page {page_num}: {encoded.format} {encoded.width}x{encoded.height}, "
+            f"{encoded.num_bytes / 1024:.0f} KB, ~{encoded.estimated_tokens} image tokens"
+        )
+        
+        image_content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": encoded.data_url
+            }
+        })
     
-    for image in images:
-        base64_image = image_to_base64(image)
-        if base64_image:
-            image_content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": base64_image
-                }
-            })
+    if trace is not None:
+        trace.add_payload("image", total_bytes)
+    
+    if image_content:
+        logger.info(f"📦 Vision payload: {total_bytes / 1024:.0f} KB, ~{total_tokens} image tokens")
     
     return image_content
 
 
-def extract_aircraft_from_pdf(file_path: str, prompt: str, dpi: int = 450) -> AircraftUtilization:
+def _build_messages(prompt: str, image_content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Build the chat messages for the vision extraction call"""
+    content = [{"type": "text", "text": prompt}] + image_content
+    
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": content
+        }
+    ]
+
+
+def _prepare_vision_content(
+    source: PdfSource,
+    dpi: int,
+    pages: Optional[Sequence[int]] = None,
+    trace: Optional[ExtractionTrace] = None
+) -> List[Dict[str, Any]]:
+    """Render the selected pages and encode them for the Vision LLM (CPU bound)"""
+    try:
+        # Pages are encoded as they are rendered, so only one raster is alive at a time
+        image_content = prepare_image_content(
+            iter_pdf_images(source, dpi=dpi, pages=pages, trace=trace),
+            trace=trace
+        )
+    except Exception as e:
+        logger.error(f"❌ Error converting PDF to images: {e}")
+        image_content = []
+    
+    if not image_content:
+        raise ValueError("Could not convert PDF to images")
+    
+    logger.info(f"✅ Converted PDF to {len(image_content)} optimized images at {dpi} DPI")
+    return image_content
+
+
+def extract_text_layer(source: PdfSource, pages: Optional[Sequence[int]] = None) -> Optional[str]:
+    """
+    Extract a compact text/table rendering of a digitally generated PDF
+    
+    Args:
+        source: Path to the PDF file or its raw bytes
+        pages: Zero-based page numbers to include (defaults to every page)
+        
+    Returns:
+        Page text with tables as markdown, or None when the PDF has no usable text layer
+    """
+    try:
+        with open_pdf(source) as doc:
+            page_numbers = list(pages) if pages is not None else list(range(len(doc)))
+            page_count = len(page_numbers)
+            sections = []
+            text_chars = 0
+            
+            for page_num in page_numbers:
+                page = doc.load_page(page_num)
+                page_text = page.get_text("text", sort=True).strip()
+                text_chars += sum(1 for ch in page_text if not ch.isspace())
+                
+                tables = []
+                try:
+                    tables = [table.to_markdown() for table in page.find_tables().tables]
+                except Exception as e:
+                    logger.debug(f"Table detection failed on page {page_num + 1}: {e}")
+                
+                sections.append(
+                    f"--- Page {page_num + 1} ---\n" + "\n\n".join(tables + [page_text])
+                )
+    
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read PDF text layer: {e}")
+        return None
+    
+    if not page_count or text_chars / page_count < Config.TEXT_LAYER_MIN_CHARS:
+        return None
+    
+    logger.info(f"📝 Usable text layer found ({text_chars} characters on {page_count} pages)")
+    return "\n\n".join(sections)
+
+
+def _build_text_messages(prompt: str, text: str) -> List[Dict[str, Any]]:
+    """Build the chat messages for the text-layer extraction call"""
+    return [
+        {
+            "role": "system",
+            "content": TEXT_SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": f"{prompt}\n\n**REPORT TEXT:**\n{text}"
+        }
+    ]
+
+
+def _accept_text_result(aircraft_data: AircraftUtilization, trace: ExtractionTrace) -> bool:
+    """Check a text-layer result, logging why it falls back to vision"""
+    with trace.stage("validation"):
+        is_valid, warnings = validate_aircraft_utilization(aircraft_data)
+    record_validation_warnings(warnings, Config.TEXT_MODEL)
+    
+    if not is_valid:
+        logger.info(f"↩️ Text-layer result incomplete ({'; '.join(warnings)}), falling back to vision")
+    
+    return is_valid
+
+
+def _create_extraction(model: str, messages: List[Dict[str, Any]]) -> AircraftUtilization:
+    """Structured extraction call through the shared LLM governor"""
+    estimated_tokens = estimate_request_tokens(messages)
+    return get_llm_governor().call(
+        lambda: get_http_clients().instructor_client().chat.completions.create(
+            model=model,
+            response_model=AircraftUtilization,
+            max_retries=instructor_retrying(model, estimated_tokens),
+            messages=messages,
+            temperature=Config.TEMPERATURE,
+        ),
+        estimated_tokens=estimated_tokens,
+        model=model
+    )
+
+
+async def _create_extraction_async(model: str, messages: List[Dict[str, Any]]) -> AircraftUtilization:
+    """Async structured extraction call through the shared LLM governor"""
+    estimated_tokens = estimate_request_tokens(messages)
+    return await get_llm_governor().call_async(
+        lambda: get_http_clients().async_instructor_client().chat.completions.create(
+            model=model,
+            response_model=AircraftUtilization,
+            max_retries=instructor_async_retrying(model, estimated_tokens),
+            messages=messages,
+            temperature=Config.TEMPERATURE,
+        ),
+        estimated_tokens=estimated_tokens,
+        model=model
+    )
+
+
+def _select_pages(source: PdfSource) -> Tuple[int, List[int]]:
+    """Return (page count, pages to send), honouring Config.PAGE_FILTER"""
+    if Config.PAGE_FILTER:
+        return select_relevant_pages(source)
+    
+    with open_pdf(source) as doc:
+        return len(doc), list(range(len(doc)))
+
+
+def _prepare_extraction(
+    source: PdfSource,
+    prompt: str,
+    dpi: int,
+    trace: ExtractionTrace,
+    file_hash: Optional[str] = None
+) -> Tuple[str, Optional[AircraftUtilization], List[int], Optional[str]]:
+    """
+    Everything before the first LLM call (CPU/disk bound)
+    
+    Returns:
+        Tuple of (cache key, cached result or None, pages to use, usable text layer or None)
+    """
+    cache = get_extraction_cache()
+    if file_hash is None:
+        with trace.stage("cache_lookup"):
+            file_hash = hash_file(source) if isinstance(source, str) else hash_bytes(source)
+    cache_key = cache.build_key(
+        file_hash,
+        prompt,
+        Config.VISION_MODEL,
+        dpi,
+        extra=(
+            f"{ImageEncodingPolicy.from_config().signature()}"
+            f"|text:{Config.TEXT_FAST_PATH}:{Config.TEXT_MODEL}"
+            f"|pages:{Config.PAGE_FILTER}:{Config.PAGE_RELEVANCE_MIN_SCORE}:{Config.PAGE_MIN_INK_RATIO}"
+        )
+    )
+    with trace.stage("cache_lookup"):
+        cached = cache.get(cache_key, AircraftUtilization)
+    
+    if cached is not None:
+        logger.info(f"⚡ Cache hit for {describe_source(source)}, skipping Vision LLM call")
+        trace.path = "cache"
+        return cache_key, cached, [], None
+    
+    with trace.stage("page_selection"):
+        trace.page_count, pages = _select_pages(source)
+    
+    text = None
+    if Config.TEXT_FAST_PATH:
+        with trace.stage("text_layer"):
+            text = extract_text_layer(source, pages)
+    
+    return cache_key, None, pages, text
+
+
+def _text_messages(prompt: str, text: str, trace: ExtractionTrace) -> List[Dict[str, Any]]:
+    """Start the text-layer path: record it on the trace and build the messages"""
+    trace.model = Config.TEXT_MODEL
+    trace.add_payload("text", len(text.encode("utf-8")))
+    logger.info("🤖 Sending text layer to Text LLM for extraction...")
+    return _build_text_messages(prompt, text)
+
+
+def _vision_messages(
+    source: PdfSource,
+    prompt: str,
+    dpi: int,
+    pages: List[int],
+    trace: ExtractionTrace
+) -> List[Dict[str, Any]]:
+    """Start the vision path: render the pages and build the messages (CPU bound)"""
+    trace.model = Config.VISION_MODEL
+    with trace.stage("render"):
+        image_content = _prepare_vision_content(source, dpi, pages, trace)
+    
+    logger.info("🤖 Sending to Vision LLM for extraction...")
+    return _build_messages(prompt, image_content)
+
+
+def _finish_extraction(
+    cache_key: str,
+    aircraft_data: AircraftUtilization,
+    trace: ExtractionTrace,
+    path: str
+) -> AircraftUtilization:
+    """Record the path taken and cache the result (disk bound)"""
+    trace.path = path
+    get_extraction_cache().put(cache_key, aircraft_data)
+    
+    if path == "text":
+        logger.info("✅ Data extracted from text layer")
+    else:
+        logger.info("✅ Data extracted and validated successfully")
+    return aircraft_data
+
+
+def extract_aircraft_from_pdf(
+    file_path: PdfInput,
+    prompt: str,
+    dpi: int = 450,
+    trace: Optional[ExtractionTrace] = None,
+    file_hash: Optional[str] = None
+) -> AircraftUtilization:
     """
     Extract aircraft data from PDF using Vision LLM
     
+    Pages without utilization data are dropped first. Digitally generated
+    PDFs are then tried through their text layer on the cheaper text model;
+    the vision path is used when there is no usable text layer or the text
+    result misses critical fields.
+    
     Args:
-        file_path: Path to the PDF file
+        file_path: Path to the PDF file, or its raw bytes or an open binary stream
         prompt: Extraction instructions
         dpi: Image resolution (default 450 for high precision)
+        trace: Optional ExtractionTrace filled with the path taken, pages used and stage timings
+        file_hash: SHA-256 of the PDF if already known (e.g. computed while downloading)
         
     Returns:
         AircraftUtilization data object
     """
     try:
-        logger.info(f"\n🔄 Processing PDF: {file_path}")
-        
+        source = read_pdf_source(file_path)
+        logger.info(f"\n🔄 Processing PDF: {describe_source(source)}")
         
-        images = pdf_to_images(file_path, dpi=dpi)
+        trace = trace or ExtractionTrace()
+        cache_key, cached, pages, text = _prepare_extraction(source, prompt, dpi, trace, file_hash)
+        if cached is not None:
+            return cached
         
-        if not images:
-            raise ValueError("Could not convert PDF to images")
+        trace.pages_used = pages
+        if text:
+            messages = _text_messages(prompt, text, trace)
+            try:
+                with trace.stage("text_llm"):
+                    aircraft_data = _create_extraction(Config.TEXT_MODEL, messages)
+                
+                if _accept_text_result(aircraft_data, trace):
+                    return _finish_extraction(cache_key, aircraft_data, trace, "text")
+                
+            except Exception as e:
+                logger.warning(f"⚠️ Text-layer extraction failed ({e}), falling back to vision")
         
+        messages = _vision_messages(source, prompt, dpi, pages, trace)
+        with trace.stage("vision_llm"):
+            aircraft_data = _create_extraction(Config.VISION_MODEL, messages)
         
-        image_content = prepare_image_content(images)
+        return _finish_extraction(cache_key, aircraft_data, trace, "vision")
         
+    except Exception as e:
+        logger.error(f"❌ Error in extraction: {str(e)}")
+        raise
+
+
+async def run_in_render_executor(func, *args):
+    """Run a blocking function on the bounded render executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_render_executor, func, *args)
+
+
+async def extract_aircraft_from_pdf_async(
+    file_path: PdfInput,
+    prompt: str,
+    dpi: int = 450,
+    trace: Optional[ExtractionTrace] = None,
+    file_hash: Optional[str] = None
+) -> AircraftUtilization:
+    """
+    Extract aircraft data from PDF without blocking the event loop
+    
+    Rendering and image encoding run on the bounded render executor and
+    the Vision LLM call goes through the async instructor client, so
+    concurrent requests overlap instead of queueing behind each other.
+    Otherwise the steps are the same as extract_aircraft_from_pdf.
+    
+    Args:
+        file_path: Path to the PDF file, or its raw bytes or an open binary stream
+        prompt: Extraction instructions
+        dpi: Image resolution (default 450 for high precision)
+        trace: Optional ExtractionTrace filled with the path taken, pages used and stage timings
+        file_hash: SHA-256 of the PDF if already known (e.g. computed while downloading)
         
-        content = [{"type": "text", "text": prompt}] + image_content
+    Returns:
+        AircraftUtilization data object
+    """
+    try:
+        source = await run_in_render_executor(read_pdf_source, file_path)
+        logger.info(f"\n🔄 Processing PDF: {describe_source(source)}")
         
-        logger.info("🤖 Sending to Vision LLM for extraction...")
+        trace = trace or ExtractionTrace()
+        cache_key, cached, pages, text = await run_in_render_executor(
+            _prepare_extraction, source, prompt, dpi, trace, file_hash
+        )
+        if cached is not None:
+            return cached
         
+        trace.pages_used = pages
+        if text:
+            messages = _text_messages(prompt, text, trace)
+            try:
+                with trace.stage("text_llm"):
+                    aircraft_data = await _create_extraction_async(Config.TEXT_MODEL, messages)
+                
+                if _accept_text_result(aircraft_data, trace):
+                    return await run_in_render_executor(_finish_extraction, cache_key, aircraft_data, trace, "text")
+                
+            except Exception as e:
+                logger.warning(f"⚠️ Text-layer extraction failed ({e}), falling back to vision")
         
-        aircraft_data = client.chat.completions.create(
-            model=Config.VISION_MODEL,
-            response_model=AircraftUtilization,
-            max_retries=Config.MAX_RETRIES,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an AI that extracts structured aircraft utilization data from maintenance report images. Carefully analyze all visual elements including text, tables, charts, stamps, and handwritten notes. Extract all information accurately according to the schema provided."
-                },
-                {
-                    "role": "user",
-                    "content": content
-                }
-            ],
-            temperature=Config.TEMPERATURE,
-        )
+        messages = await run_in_render_executor(_vision_messages, source, prompt, dpi, pages, trace)
+        with trace.stage("vision_llm"):
+            aircraft_data = await _create_extraction_async(Config.VISION_MODEL, messages)
         
-        logger.info("✅ Data extracted and validated successfully")
-        return aircraft_data
+        return await run_in_render_executor(_finish_extraction, cache_key, aircraft_data, trace, "vision")
         
     except Exception as e:
         logger.error(f"❌ Error in extraction: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def shutdown_render_executor() -> None:
+    """Stop the render executor (called on application shutdown)"""
+    _render_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,224 @@
+"""
+Content-addressed cache for LLM extraction results
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from src.config.config import Config
+from src.utils.cache.lru_cache import LRUCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of raw bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier extraction result cache
+
+    A bounded in-memory LRU sits in front of a size-capped directory of
+    JSON files. Entries are keyed by the content hash of the source file
+    together with everything else that changes the LLM output (prompt,
+    model, DPI), so a repeated upload never triggers a second paid call.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: int,
+        max_disk_bytes: int,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.cache_dir = Path(cache_dir)
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = LRUCache(max_entries)
+        self._disk_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "disk_evictions": 0,
+        }
+
+    @staticmethod
+    def build_key(
+        file_hash: str,
+        prompt: str,
+        model: str,
+        dpi: Optional[int] = None,
+        extra: str = ""
+    ) -> str:
+        """
+        Build the cache key for an extraction
+
+        Args:
+            file_hash: SHA-256 of the source file bytes
+            prompt: Extraction prompt sent to the LLM
+            model: Model identifier used for the extraction
+            dpi: Render resolution (None for inputs that are not rendered)
+            extra: Any other setting that changes the LLM input
+
+        Returns:
+            Hex digest identifying the extraction
+        """
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        material = "|".join([file_hash, prompt_hash, model, str(dpi), extra])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, model_cls: Type[ModelT]) -> Optional[ModelT]:
+        """
+        Look up a cached extraction result
+
+        Args:
+            key: Key from build_key
+            model_cls: Pydantic model the result is restored as
+
+        Returns:
+            Cached model instance, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        payload = self._memory.get(key)
+        if payload is not None:
+            self._count("memory_hits")
+            return model_cls.model_validate(payload)
+
+        payload = self._read_disk(key)
+        if payload is not None:
+            self._memory.set(key, payload)
+            self._count("disk_hits")
+            return model_cls.model_validate(payload)
+
+        self._count("misses")
+        return None
+
+    def put(self, key: str, result: BaseModel) -> None:
+        """Store an extraction result in both tiers"""
+        if not self.enabled:
+            return
+
+        payload = result.model_dump()
+        self._memory.set(key, payload)
+        self._write_disk(key, payload)
+        self._count("stores")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats.update({
+            "enabled": self.enabled,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_evictions": self._memory.evictions,
+            "disk_bytes": self._disk_usage(),
+            "max_disk_bytes": self.max_disk_bytes,
+        })
+        return stats
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            # Refresh mtime so disk eviction is least-recently-used
+            os.utime(path, None)
+            return payload
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+
+    def _write_disk(self, key: str, payload: Dict[str, Any]) -> None:
+        if self.max_disk_bytes <= 0:
+            return
+
+        try:
+            with self._disk_lock:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                path = self._path_for(key)
+                tmp_path = path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+                self._enforce_disk_limit()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not write cache entry: {e}")
+
+    def _enforce_disk_limit(self) -> None:
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_disk_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            path.unlink(missing_ok=True)
+            total -= size
+            self._count("disk_evictions")
+            if total <= self.max_disk_bytes:
+                break
+
+    def _disk_usage(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return sum(path.stat().st_size for path in self.cache_dir.glob("*.json"))
+
+
+# Singleton instance
+_extraction_cache = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """Get or create extraction cache instance"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        _extraction_cache = ExtractionCache(
+            cache_dir=Config.CACHE_DIR,
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_disk_bytes=Config.CACHE_MAX_DISK_MB * 1024 * 1024,
+            enabled=Config.CACHE_ENABLED
+        )
+    return _extraction_cache
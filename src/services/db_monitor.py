@@ -0,0 +1,177 @@
+"""
+Database readiness probe, pool configuration and pool metrics
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from prisma import Prisma
+
+from src.config.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_PING_SAMPLES = 1000
+
+# Prisma engine metrics (requires previewFeatures = ["metrics"])
+_POOL_GAUGES = {
+    "prisma_pool_connections_open": "open",
+    "prisma_pool_connections_busy": "busy",
+    "prisma_pool_connections_idle": "idle",
+    "prisma_client_queries_wait": "waiting_queries",
+    "prisma_client_queries_active": "active_queries",
+}
+_HISTOGRAMS = {
+    "prisma_client_queries_wait_histogram_ms": "pool_wait_ms",
+    "prisma_client_queries_duration_histogram_ms": "query_ms",
+}
+
+
+def build_datasource_url(url: Optional[str]) -> Optional[str]:
+    """
+    Add the pool settings from Config to a Postgres connection URL
+
+    Parameters already present in DATABASE_URL win, so a deployment can
+    still tune them per environment.
+    """
+    if not url:
+        return url
+
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query))
+    params.setdefault("connection_limit", str(Config.DB_CONNECTION_LIMIT))
+    params.setdefault("pool_timeout", str(Config.DB_POOL_TIMEOUT_SECONDS))
+    params.setdefault("connect_timeout", str(Config.DB_CONNECT_TIMEOUT_SECONDS))
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def pool_settings(url: Optional[str]) -> Dict[str, float]:
+    """
+    Effective pool settings of a datasource URL built by build_datasource_url
+
+    Values set in the URL win over Config, exactly as the query engine sees them.
+    """
+    params = dict(parse_qsl(urlsplit(url).query)) if url else {}
+
+    def setting(name: str, default: float) -> float:
+        try:
+            return float(params[name]) if name in params else default
+        except ValueError:
+            return default
+
+    return {
+        "connection_limit": int(setting("connection_limit", Config.DB_CONNECTION_LIMIT)),
+        "pool_timeout_seconds": setting("pool_timeout", Config.DB_POOL_TIMEOUT_SECONDS),
+        "connect_timeout_seconds": setting("connect_timeout", Config.DB_CONNECT_TIMEOUT_SECONDS),
+    }
+
+
+def _histogram_percentiles(buckets: List[Tuple[float, int]], count: int) -> Dict[str, Any]:
+    """Upper-bound percentile estimates from Prisma histogram buckets"""
+    def percentile(fraction: float) -> Optional[float]:
+        seen = 0
+        for upper, bucket_count in buckets:
+            seen += bucket_count
+            if seen >= fraction * count:
+                return upper
+        return None
+
+    return {
+        "count": count,
+        "p50": percentile(0.5) if count else 0.0,
+        "p95": percentile(0.95) if count else 0.0,
+        "p99": percentile(0.99) if count else 0.0,
+    }
+
+
+class DatabaseMonitor:
+    """
+    Checks that the database actually answers and reports pool health
+
+    The readiness probe runs a real SELECT 1 under a deadline; pool
+    saturation, wait time and query latency come from the Prisma engine's
+    metrics.
+    """
+
+    def __init__(self, db: Prisma, datasource_url: Optional[str] = None):
+        self.db = db
+        self.pool = pool_settings(datasource_url)
+        self._lock = threading.Lock()
+        self._ping_seconds = deque(maxlen=_PING_SAMPLES)
+        self._failures = 0
+
+    async def ping(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run SELECT 1 with a deadline
+
+        Returns:
+            Dict with ready flag, latency and the error when not ready
+        """
+        timeout = timeout or Config.DB_READY_TIMEOUT_SECONDS
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db.query_raw("SELECT 1 AS ok"), timeout=timeout)
+        except asyncio.TimeoutError:
+            return self._failed(start, f"SELECT 1 did not complete within {timeout}s")
+        except Exception as e:
+            return self._failed(start, str(e))
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._ping_seconds.append(elapsed)
+        return {"ready": True, "latency_ms": round(elapsed * 1000, 2)}
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return pool settings, saturation, wait and latency percentiles"""
+        with self._lock:
+            samples = sorted(self._ping_seconds)
+            failures = self._failures
+
+        stats = {
+            "pool": dict(self.pool),
+            "ping": {
+                "failures": failures,
+                "samples": len(samples),
+                "p50_ms": round(samples[len(samples) // 2] * 1000, 2) if samples else 0.0,
+                "p95_ms": round(samples[int(len(samples) * 0.95)] * 1000, 2) if samples else 0.0,
+                "max_ms": round(samples[-1] * 1000, 2) if samples else 0.0,
+            },
+        }
+
+        try:
+            stats.update(await self._engine_metrics())
+        except Exception as e:
+            logger.warning(f"⚠️ Prisma metrics unavailable: {e}")
+            stats["engine_metrics_error"] = str(e)
+
+        return stats
+
+    async def _engine_metrics(self) -> Dict[str, Any]:
+        metrics = await self.db.get_metrics()
+        pool = {}
+        for gauge in metrics.gauges:
+            if gauge.key in _POOL_GAUGES:
+                pool[_POOL_GAUGES[gauge.key]] = gauge.value
+
+        limit = self.pool["connection_limit"]
+        if "busy" in pool and limit:
+            pool["saturation"] = round(pool["busy"] / limit, 4)
+
+        result: Dict[str, Any] = {"pool_usage": pool}
+        for histogram in metrics.histograms:
+            if histogram.key in _HISTOGRAMS:
+                value = histogram.value
+                result[_HISTOGRAMS[histogram.key]] = _histogram_percentiles(value.buckets, value.count)
+        return result
+
+    def _failed(self, start: float, error: str) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._failures += 1
+        logger.error(f"❌ Database readiness check failed: {error}")
+        return {"ready": False, "latency_ms": round(elapsed * 1000, 2), "error": error}
@@ -0,0 +1,169 @@
+"""
+Streaming download of remote PDFs
+"""
+import asyncio
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from src.config.config import Config
+from src.services.http_clients import get_http_clients
+from src.utils.reader.pdf_reader import PDF_HEADER_WINDOW, PdfSource, has_pdf_header
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Content types expected for PDFs; anything else is only logged, the bytes decide
+PDF_CONTENT_TYPES = {
+    "application/pdf",
+    "application/x-pdf",
+    "application/octet-stream",
+    "binary/octet-stream",
+}
+
+
+class DownloadError(ValueError):
+    """Remote file rejected before or while downloading"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class DownloadedFile:
+    """
+    A downloaded PDF held in memory, or on disk once it outgrows the spool
+
+    Attributes:
+        sha256: Hex digest computed while the bytes arrived
+        size: Number of bytes downloaded
+    """
+
+    def __init__(self):
+        self.sha256: Optional[str] = None
+        self.size = 0
+        self._buffer: Optional[bytearray] = bytearray()
+        self._temp_file = None
+        self._path: Optional[str] = None
+
+    @property
+    def in_memory(self) -> bool:
+        return self._path is None
+
+    @property
+    def source(self) -> PdfSource:
+        """The PDF as accepted by the extraction pipeline (bytes or path)"""
+        return self._buffer if self.in_memory else self._path
+
+    async def _write(self, chunk: bytes) -> None:
+        if self.in_memory and len(self._buffer) + len(chunk) > Config.DOWNLOAD_SPOOL_MAX_BYTES:
+            await asyncio.to_thread(self._roll_over)
+
+        if self.in_memory:
+            self._buffer.extend(chunk)
+        else:
+            await asyncio.to_thread(self._temp_file.write, chunk)
+
+    def _roll_over(self) -> None:
+        """Move the spooled bytes to a temporary file on disk"""
+        self._temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+        self._temp_file.write(self._buffer)
+        self._path = self._temp_file.name
+        self._buffer = None
+
+    def _finish(self) -> None:
+        if self._temp_file is not None:
+            self._temp_file.close()
+            self._temp_file = None
+
+    def close(self) -> None:
+        """Release the buffer or delete the temporary file"""
+        self._finish()
+        self._buffer = None
+        if self._path and Path(self._path).exists():
+            try:
+                Path(self._path).unlink()
+                logger.info("🧹 Cleaned up temporary file")
+            except Exception as e:
+                logger.warning(f"⚠️ Could not delete temporary file: {e}")
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";")[0].strip().lower()
+
+
+def _check_header(head: bytes, media_type: str) -> None:
+    if not has_pdf_header(head):
+        served_as = f" (served as '{media_type}')" if media_type else ""
+        raise DownloadError(f"Downloaded file is not a PDF{served_as}", status_code=415)
+
+
+async def download_pdf(url: str) -> DownloadedFile:
+    """
+    Stream a remote PDF, enforcing type and size limits as bytes arrive
+
+    The file is accepted on its content: %PDF- must appear in the first
+    KB. The Content-Type header is only a hint, since many hosts serve PDFs
+    as octet-stream or something less accurate.
+
+    Small files stay in memory; anything above Config.DOWNLOAD_SPOOL_MAX_BYTES
+    is spilled to a temporary file. The SHA-256 is computed on the fly so the
+    result cache can be checked before any rendering.
+
+    Args:
+        url: File URL
+
+    Returns:
+        DownloadedFile (call close() when done)
+
+    Raises:
+        DownloadError: Not a PDF, or larger than Config.DOWNLOAD_MAX_BYTES
+        httpx.HTTPError: Network or HTTP status errors
+    """
+    max_bytes = Config.DOWNLOAD_MAX_BYTES
+    downloaded = DownloadedFile()
+    digest = hashlib.sha256()
+    head = bytearray()
+
+    try:
+        async with get_http_clients().download_client().stream("GET", url) as response:
+            response.raise_for_status()
+            media_type = _media_type(response.headers.get("content-type", ""))
+            if media_type and media_type not in PDF_CONTENT_TYPES:
+                logger.info(f"ℹ️ {url} is served as '{media_type}', checking the bytes instead")
+
+            content_length = response.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise DownloadError(f"File is {int(content_length)} bytes, limit is {max_bytes}", status_code=413)
+
+            async for chunk in response.aiter_bytes(Config.DOWNLOAD_CHUNK_SIZE):
+                if head is not None:
+                    head.extend(chunk[:PDF_HEADER_WINDOW - len(head)])
+                    if len(head) >= PDF_HEADER_WINDOW:
+                        _check_header(head, media_type)
+                        head = None
+
+                downloaded.size += len(chunk)
+                if downloaded.size > max_bytes:
+                    raise DownloadError(f"File exceeds the {max_bytes} byte limit", status_code=413)
+
+                digest.update(chunk)
+                await downloaded._write(chunk)
+
+        if head is not None:
+            # Files shorter than the header window
+            _check_header(head, media_type)
+
+        downloaded._finish()
+        downloaded.sha256 = digest.hexdigest()
+        logger.info(
+            f"📥 Downloaded {downloaded.size} bytes "
+            f"({'memory' if downloaded.in_memory else 'disk'}), sha256 {downloaded.sha256[:12]}…"
+        )
+        return downloaded
+
+    except BaseException:
+        downloaded.close()
+        raise
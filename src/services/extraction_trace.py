@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class ExtractionTrace:
+    """
+    Records how a document was extracted
+
+    Passed through the extraction pipeline by callers that want to report
+    the path taken (cache, text layer or vision), the pages sent and how
+    long each stage took.
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.page_count: Optional[int] = None
+        self.pages_used: List[int] = []
+        self.timings: Dict[str, float] = {}
+        self.model: Optional[str] = None
+        # Bytes sent to the LLM, by kind ("image" or "text")
+        self.payload_bytes: Dict[str, int] = {}
+
+    def add_timing(self, stage: str, seconds: float) -> None:
+        """Accumulate time spent in a stage (stages may run more than once)"""
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def add_payload(self, kind: str, num_bytes: int) -> None:
+        self.payload_bytes[kind] = self.payload_bytes.get(kind, 0) + num_bytes
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a pipeline stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "model": self.model,
+            "page_count": self.page_count,
+            # 1-based page numbers, as a reader would count them
+            "pages_used": [page + 1 for page in self.pages_used],
+            "timings_ms": {stage: round(seconds * 1000, 1) for stage, seconds in self.timings.items()},
+            "payload_bytes": dict(self.payload_bytes),
+        }
+
+
+def maybe_stage(trace: Optional[ExtractionTrace], name: str):
+    """trace.stage(name), or a no-op when the caller did not ask for a trace"""
+    return trace.stage(name) if trace is not None else nullcontext()
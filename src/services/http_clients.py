@@ -0,0 +1,218 @@
+"""
+Shared, pooled HTTP clients for OpenRouter and file downloads
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import httpx
+import instructor
+from openai import AsyncOpenAI, OpenAI
+
+from src.config.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+_CONNECT_SAMPLES = 500
+
+
+class PoolStats:
+    """Request, connection and connect-latency counters for one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._connect_seconds = deque(maxlen=_CONNECT_SAMPLES)
+
+    def _record(self, connect_started: Optional[float]) -> None:
+        with self._lock:
+            self._requests += 1
+            if connect_started is not None:
+                self._new_connections += 1
+                self._connect_seconds.append(time.perf_counter() - connect_started)
+
+    def _handle(self, state: Dict[str, float], event_name: str) -> None:
+        # httpcore only emits connect events when the pool had to open a new connection
+        if event_name == "connection.connect_tcp.started":
+            state["connect_started"] = time.perf_counter()
+        elif event_name.endswith(".send_request_headers.started"):
+            self._record(state.pop("connect_started", None))
+
+    def request_hook(self, request: httpx.Request) -> None:
+        state: Dict[str, float] = {}
+        request.extensions["trace"] = lambda event_name, info: self._handle(state, event_name)
+
+    async def async_request_hook(self, request: httpx.Request) -> None:
+        state: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            self._handle(state, event_name)
+
+        request.extensions["trace"] = trace
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = self._requests
+            new_connections = self._new_connections
+            samples = sorted(self._connect_seconds)
+
+        reused = max(0, requests - new_connections)
+        return {
+            "requests": requests,
+            "new_connections": new_connections,
+            "pool_hits": reused,
+            "reuse_rate": round(reused / requests, 4) if requests else 0.0,
+            "connect_ms": {
+                "samples": len(samples),
+                "p50": round(samples[len(samples) // 2] * 1000, 1) if samples else 0.0,
+                "p95": round(samples[int(len(samples) * 0.95)] * 1000, 1) if samples else 0.0,
+                "max": round(samples[-1] * 1000, 1) if samples else 0.0,
+            },
+        }
+
+
+class HttpClients:
+    """
+    Owns every outbound HTTP connection pool
+
+    One keep-alive (optionally HTTP/2) pool is used for OpenRouter, shared
+    by the sync and async OpenAI/instructor clients of all services, and a
+    second pool is used for downloading files. Started in FastAPI startup and
+    closed on shutdown; CLI callers get the clients lazily.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llm_sync: Optional[httpx.Client] = None
+        self._llm_async: Optional[httpx.AsyncClient] = None
+        self._download: Optional[httpx.AsyncClient] = None
+        self._instructor_sync = None
+        self._instructor_async = None
+        self.llm_stats = PoolStats("openrouter")
+        self.download_stats = PoolStats("downloads")
+
+    @staticmethod
+    def _llm_limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=Config.LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+        )
+
+    @staticmethod
+    def _llm_timeout() -> httpx.Timeout:
+        return httpx.Timeout(Config.LLM_TIMEOUT_SECONDS, connect=Config.HTTP_CONNECT_TIMEOUT)
+
+    def start(self) -> None:
+        """Create the async pools up front (called on application startup)"""
+        self.llm_async_client()
+        self.download_client()
+        logger.info(
+            f"🔌 HTTP pools ready (OpenRouter max {Config.LLM_POOL_MAX_CONNECTIONS}, "
+            f"downloads max {Config.DOWNLOAD_POOL_MAX_CONNECTIONS}, http2={Config.HTTP2_ENABLED})"
+        )
+
+    async def close(self) -> None:
+        """Close every pool (called on application shutdown)"""
+        with self._lock:
+            llm_sync, llm_async, download = self._llm_sync, self._llm_async, self._download
+            self._llm_sync = self._llm_async = self._download = None
+            self._instructor_sync = self._instructor_async = None
+
+        if llm_sync is not None:
+            llm_sync.close()
+        if llm_async is not None:
+            await llm_async.aclose()
+        if download is not None:
+            await download.aclose()
+        logger.info("👋 HTTP pools closed")
+
+    def llm_client(self) -> httpx.Client:
+        with self._lock:
+            if self._llm_sync is None:
+                self._llm_sync = httpx.Client(
+                    limits=self._llm_limits(),
+                    timeout=self._llm_timeout(),
+                    http2=Config.HTTP2_ENABLED,
+                    event_hooks={"request": [self.llm_stats.request_hook]}
+                )
+            return self._llm_sync
+
+    def llm_async_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._llm_async is None:
+                self._llm_async = httpx.AsyncClient(
+                    limits=self._llm_limits(),
+                    timeout=self._llm_timeout(),
+                    http2=Config.HTTP2_ENABLED,
+                    event_hooks={"request": [self.llm_stats.async_request_hook]}
+                )
+            return self._llm_async
+
+    def download_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._download is None:
+                self._download = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=Config.DOWNLOAD_POOL_MAX_CONNECTIONS,
+                        max_keepalive_connections=Config.DOWNLOAD_POOL_MAX_KEEPALIVE,
+                        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+                    ),
+                    timeout=httpx.Timeout(Config.DOWNLOAD_TIMEOUT_SECONDS, connect=Config.HTTP_CONNECT_TIMEOUT),
+                    http2=Config.HTTP2_ENABLED,
+                    follow_redirects=True,
+                    event_hooks={"request": [self.download_stats.async_request_hook]}
+                )
+            return self._download
+
+    def instructor_client(self) -> instructor.Instructor:
+        """Sync instructor client bound to the shared OpenRouter pool"""
+        http_client = self.llm_client()
+        with self._lock:
+            if self._instructor_sync is None:
+                # SDK-level retries are disabled: rate limits are retried by the shared LLM governor
+                self._instructor_sync = instructor.from_openai(OpenAI(
+                    base_url=OPENROUTER_BASE_URL,
+                    api_key=Config.OPENROUTER_API_KEY,
+                    max_retries=0,
+                    http_client=http_client
+                ))
+            return self._instructor_sync
+
+    def async_instructor_client(self) -> instructor.AsyncInstructor:
+        """Async instructor client bound to the shared OpenRouter pool"""
+        http_client = self.llm_async_client()
+        with self._lock:
+            if self._instructor_async is None:
+                self._instructor_async = instructor.from_openai(AsyncOpenAI(
+                    base_url=OPENROUTER_BASE_URL,
+                    api_key=Config.OPENROUTER_API_KEY,
+                    max_retries=0,
+                    http_client=http_client
+                ))
+            return self._instructor_async
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool hit, reuse and connect-latency figures per pool"""
+        return {
+            "openrouter": self.llm_stats.snapshot(),
+            "downloads": self.download_stats.snapshot(),
+        }
+
+
+# Singleton instance
+_http_clients = None
+
+def get_http_clients() -> HttpClients:
+    """Get or create the shared HTTP clients"""
+    global _http_clients
+    if _http_clients is None:
+        _http_clients = HttpClients()
+    return _http_clients
@@ -0,0 +1,373 @@
+"""
+Background job service for long-running extractions
+"""
+import asyncio
+import json
+import logging
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.config.config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Runs the extraction pipeline: (file_path, filename) -> response payload
+JobRunner = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class JobService:
+    """
+    Durable in-process job queue
+
+    Jobs and their uploaded files are persisted in a local SQLite database
+    and directory before a job id is returned, so queued or interrupted
+    work is picked up again when the service restarts.
+
+    Several processes (e.g. uvicorn workers) may share the store: a job is
+    claimed atomically with a lease that its runner keeps renewing, and is
+    only taken over once the lease has expired. Each claim counts as an
+    attempt; a job whose attempts run out (e.g. it keeps crashing the
+    process) is marked failed instead of being re-queued forever.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        files_dir: str,
+        workers: int,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 3
+    ):
+        self.db_path = Path(db_path)
+        self.files_dir = Path(files_dir)
+        self.workers = max(1, workers)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        # Identifies this process's claims in the shared store
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self._queue: "asyncio.Queue[str]" = None
+        self._tasks: List[asyncio.Task] = []
+        self._runner: Optional[JobRunner] = None
+
+    async def start(self, runner: JobRunner) -> None:
+        """Open the store, re-queue unfinished jobs and start the workers"""
+        self._runner = runner
+        self._queue = asyncio.Queue()
+        await asyncio.to_thread(self._open_store)
+
+        await self._enqueue_claimable()
+
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep_expired_leases()))
+        logger.info(f"✅ Job service started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers; their running jobs are released back to the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+        logger.info("👋 Job service stopped")
+
+    async def submit(self, source_path: str, filename: str) -> Dict[str, Any]:
+        """
+        Persist a new job and queue it
+
+        Args:
+            source_path: Temporary file holding the uploaded PDF (moved into the job store,
+                or deleted if the job cannot be stored)
+            filename: Original file name
+
+        Returns:
+            The stored job record
+        """
+        job_id = uuid.uuid4().hex
+        file_path = self.files_dir / f"{job_id}.pdf"
+
+        now = datetime.now().isoformat()
+        try:
+            await asyncio.to_thread(shutil.move, source_path, file_path)
+            await asyncio.to_thread(
+                self._execute,
+                "INSERT INTO jobs (id, status, filename, file_path, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, filename, str(file_path), now)
+            )
+        except BaseException:
+            # No job references the file: remove it wherever the move left it
+            Path(source_path).unlink(missing_ok=True)
+            file_path.unlink(missing_ok=True)
+            raise
+        self._queue.put_nowait(job_id)
+
+        logger.info(f"📝 Queued job {job_id} for {filename} (queue depth {self._queue.qsize()})")
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job record, or None if the id is unknown"""
+        row = await asyncio.to_thread(self._fetch_one, job_id)
+        return self._format_job(row) if row else None
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Worker {worker_id} failed on job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _enqueue_claimable(self) -> None:
+        """Queue jobs that are waiting or whose owner's lease has expired"""
+        pending = await asyncio.to_thread(self._claimable_jobs)
+        for job_id in pending:
+            self._queue.put_nowait(job_id)
+        if pending:
+            logger.info(f"♻️ Queued {len(pending)} unfinished jobs")
+
+    async def _sweep_expired_leases(self) -> None:
+        """Pick up jobs abandoned by another process while this one keeps running"""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                expired = await asyncio.to_thread(self._expired_jobs)
+            except Exception as e:
+                logger.error(f"❌ Job lease sweep failed: {e}")
+                continue
+            for job_id in expired:
+                self._queue.put_nowait(job_id)
+
+    async def _renew_lease(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(
+                self._execute,
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND owner = ?",
+                (time.time() + self.lease_seconds, job_id, self.owner)
+            )
+
+    async def _run_job(self, job_id: str) -> None:
+        row = await asyncio.to_thread(self._claim, job_id)
+        if row is None:
+            return
+
+        started_at = datetime.now()
+        queued_seconds = (started_at - datetime.fromisoformat(row["created_at"])).total_seconds()
+        logger.info(f"🏃 Running job {job_id} ({row['filename']}, attempt {row['attempts']}/{self.max_attempts})")
+
+        start = time.perf_counter()
+        status, result, error = JOB_SUCCEEDED, None, None
+        lease = asyncio.create_task(self._renew_lease(job_id))
+        try:
+            result = await self._runner(row["file_path"], row["filename"])
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back without spending an attempt
+            await asyncio.to_thread(self._release, job_id)
+            raise
+        except Exception as e:
+            status, error = JOB_FAILED, str(e)
+            logger.error(f"❌ Job {job_id} failed: {error}")
+        finally:
+            lease.cancel()
+
+        timings = {"queued": round(queued_seconds * 1000, 1)}
+        if result:
+            timings.update(result.get("extraction", {}).get("timings_ms", {}))
+        timings["total"] = round((time.perf_counter() - start) * 1000, 1)
+
+        updated = await asyncio.to_thread(
+            self._execute,
+            "UPDATE jobs SET status = ?, finished_at = ?, timings = ?, result = ?, error = ?, "
+            "owner = NULL, lease_expires_at = NULL WHERE id = ? AND owner = ?",
+            (
+                status,
+                datetime.now().isoformat(),
+                json.dumps(timings),
+                json.dumps(result, ensure_ascii=False) if result is not None else None,
+                error,
+                job_id,
+                self.owner
+            )
+        )
+        if updated == 0:
+            # The lease expired and another worker reclaimed the job: its input file is theirs now
+            logger.warning(f"⚠️ Job {job_id} lost its lease, discarding status {status}")
+            return
+
+        Path(row["file_path"]).unlink(missing_ok=True)
+        logger.info(f"✅ Job {job_id} finished with status {status}")
+
+    def _open_store(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._db_lock:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT,
+                    timings TEXT,
+                    result TEXT,
+                    error TEXT,
+                    owner TEXT,
+                    lease_expires_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            # Stores created before leases existed
+            columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            for column, definition in (
+                ("owner", "TEXT"),
+                ("lease_expires_at", "REAL"),
+                ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+            ):
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, created_at)")
+            self._db.commit()
+
+    def _claimable_jobs(self) -> List[str]:
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND COALESCE(lease_expires_at, 0) < ?) "
+                "ORDER BY created_at",
+                (JOB_QUEUED, JOB_RUNNING, time.time())
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def _expired_jobs(self) -> List[str]:
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs WHERE status = ? AND COALESCE(lease_expires_at, 0) < ? ORDER BY created_at",
+                (JOB_RUNNING, time.time())
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def _claim(self, job_id: str) -> Optional[sqlite3.Row]:
+        """
+        Atomically take a queued job, or a running one whose lease expired
+
+        Returns:
+            The claimed row, or None if another process holds it, it is
+            finished, or its attempts ran out (it is then marked failed)
+        """
+        now = time.time()
+        claimable = "id = ? AND (status = ? OR (status = ? AND COALESCE(lease_expires_at, 0) < ?))"
+        with self._db_lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_expires_at = ?, attempts = attempts + 1, "
+                f"started_at = ? WHERE attempts < ? AND {claimable}",
+                (
+                    JOB_RUNNING, self.owner, now + self.lease_seconds, datetime.now().isoformat(),
+                    self.max_attempts, job_id, JOB_QUEUED, JOB_RUNNING, now
+                )
+            )
+            if cursor.rowcount == 0:
+                cursor = self._db.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ?, owner = NULL, lease_expires_at = NULL "
+                    f"WHERE attempts >= ? AND {claimable}",
+                    (
+                        JOB_FAILED, datetime.now().isoformat(),
+                        f"Gave up after {self.max_attempts} attempts (the job did not finish)",
+                        self.max_attempts, job_id, JOB_QUEUED, JOB_RUNNING, now
+                    )
+                )
+                self._db.commit()
+                if cursor.rowcount:
+                    logger.error(f"❌ Job {job_id} failed: no attempts left")
+                    row = self._db.execute("SELECT file_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                    Path(row["file_path"]).unlink(missing_ok=True)
+                return None
+
+            self._db.commit()
+            return self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def _release(self, job_id: str) -> None:
+        """Put a job this process was running back in the queue, refunding the attempt"""
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, owner = NULL, lease_expires_at = NULL, "
+            "attempts = attempts - 1 WHERE id = ? AND owner = ?",
+            (JOB_QUEUED, job_id, self.owner)
+        )
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        """Run a write statement and return the number of rows it changed"""
+        with self._db_lock:
+            cursor = self._db.execute(sql, params)
+            self._db.commit()
+            return cursor.rowcount
+
+    def _fetch_one(self, job_id: str) -> Optional[sqlite3.Row]:
+        with self._db_lock:
+            return self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    def _format_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        Format job record for response
+        """
+        result = json.loads(row["result"]) if row["result"] else None
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "timings_ms": json.loads(row["timings"]) if row["timings"] else {},
+            "result": result,
+            "error": row["error"],
+            "attempts": row["attempts"]
+        }
+
+
+# Singleton instance
+_job_service = None
+
+def get_job_service() -> JobService:
+    """Get or create job service instance"""
+    global _job_service
+    if _job_service is None:
+        _job_service = JobService(
+            db_path=Config.JOBS_DB_PATH,
+            files_dir=Config.JOBS_DIR,
+            workers=Config.JOB_WORKERS,
+            lease_seconds=Config.JOB_LEASE_SECONDS,
+            max_attempts=Config.JOB_MAX_ATTEMPTS
+        )
+    return _job_service
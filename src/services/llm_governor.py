@@ -0,0 +1,434 @@
+"""
+Shared rate limiter and concurrency governor for OpenRouter calls
+"""
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from openai import APIStatusError, RateLimitError
+from pydantic import ValidationError
+from tenacity import AsyncRetrying, RetryCallState, Retrying, retry_if_exception, stop_after_attempt
+
+from src.config.config import Config
+from src.services.metrics import record_llm_retry
+from src.utils.image.image_encoding import data_url_image_size, estimate_image_tokens
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rough prompt-token cost of text
+_CHARS_PER_TOKEN = 4
+_RETRYABLE_STATUS = (429, 503)
+_WAIT_SAMPLES = 1000
+
+
+def find_rate_limit_error(error: BaseException) -> Optional[APIStatusError]:
+    """Return the 429/503 API error behind an exception (instructor may wrap it)"""
+    seen = 0
+    while error is not None and seen < 5:
+        if isinstance(error, RateLimitError):
+            return error
+        if isinstance(error, APIStatusError) and error.status_code in _RETRYABLE_STATUS:
+            return error
+        error = error.__cause__ or error.__context__
+        seen += 1
+    return None
+
+
+def is_validation_error(error: BaseException) -> bool:
+    """True for errors instructor re-asks on: schema validation or malformed JSON (possibly wrapped)"""
+    seen = 0
+    while error is not None and seen < 5:
+        if isinstance(error, (ValidationError, json.JSONDecodeError)):
+            return True
+        error = error.__cause__ or error.__context__
+        seen += 1
+    return False
+
+
+def _reask_wait(estimated_tokens: int) -> Callable[[RetryCallState], float]:
+    """tenacity wait: how long the re-ask has to wait for the governor's buckets"""
+    return lambda retry_state: get_llm_governor().reask_delay(estimated_tokens)
+
+
+def _before_reask(model: Optional[str], estimated_tokens: int) -> Callable[[RetryCallState], None]:
+    """tenacity before_sleep: count the re-ask and charge it to the buckets (it is another request)"""
+    def before_sleep(retry_state: RetryCallState) -> None:
+        record_llm_retry(model, "validation")
+        get_llm_governor().charge(estimated_tokens)
+    return before_sleep
+
+
+def instructor_retrying(model: Optional[str] = None, estimated_tokens: int = 0) -> Retrying:
+    """
+    Instructor retry policy: re-ask only on validation errors
+
+    API errors (429s included, which the governor handles, but also 4xx
+    and timeouts) are raised straight away instead of being re-sent.
+    Allows Config.MAX_RETRIES re-asks after the first attempt, as an int
+    max_retries does in instructor.
+    """
+    return Retrying(
+        stop=stop_after_attempt(Config.MAX_RETRIES + 1),
+        retry=retry_if_exception(is_validation_error),
+        wait=_reask_wait(estimated_tokens),
+        before_sleep=_before_reask(model, estimated_tokens)
+    )
+
+
+def instructor_async_retrying(model: Optional[str] = None, estimated_tokens: int = 0) -> AsyncRetrying:
+    """Async variant of instructor_retrying"""
+    return AsyncRetrying(
+        stop=stop_after_attempt(Config.MAX_RETRIES + 1),
+        retry=retry_if_exception(is_validation_error),
+        wait=_reask_wait(estimated_tokens),
+        before_sleep=_before_reask(model, estimated_tokens)
+    )
+
+
+def estimate_request_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Estimate prompt plus completion tokens for a chat request"""
+    tokens = Config.LLM_OUTPUT_TOKEN_ESTIMATE
+
+    for message in messages:
+        content = message["content"]
+        if isinstance(content, str):
+            tokens += len(content) // _CHARS_PER_TOKEN
+            continue
+        for part in content:
+            if part.get("type") == "image_url":
+                # Priced from the image's own size; the flat estimate only when it cannot be read
+                size = data_url_image_size(part["image_url"]["url"])
+                tokens += estimate_image_tokens(*size) if size else Config.LLM_IMAGE_TOKEN_ESTIMATE
+            else:
+                tokens += len(part.get("text", "")) // _CHARS_PER_TOKEN
+
+    return tokens
+
+
+def _retry_after_seconds(error: APIStatusError) -> Optional[float]:
+    """Read Retry-After (seconds or HTTP date) or retry-after-ms from a response"""
+    headers = getattr(error.response, "headers", None) or {}
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class _SlotWaiter:
+    """A caller queued for an in-flight slot; granted is only changed under the governor lock"""
+
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake: Callable[[], None]):
+        self.wake = wake
+        self.granted = False
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LLMGovernor:
+    """
+    Process-wide limiter wrapped around every LLM call
+
+    Combines a requests-per-minute and an estimated tokens-per-minute token
+    bucket with a cap on in-flight calls. A 429/503 pauses all callers for
+    the server's Retry-After (or an exponential backoff) before retrying.
+    Works for both sync (CLI) and async (API) callers.
+
+    The in-flight cap is a FIFO semaphore shared by threads and event
+    loops: a released slot is handed straight to the oldest waiter, so
+    later arrivals cannot starve it and idle waiters do not poll.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_in_flight: int,
+        max_rate_limit_retries: int
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_rate_limit_retries = max_rate_limit_retries
+
+        self._lock = threading.Lock()
+        self._request_budget = float(requests_per_minute)
+        self._token_budget = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._free_slots = self.max_in_flight
+        self._slot_waiters: Deque[_SlotWaiter] = deque()
+        self._waiting = 0
+
+        self._waits = deque(maxlen=_WAIT_SAMPLES)
+        self._counters = {
+            "calls": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "reasks": 0,
+            "failures": 0,
+        }
+
+    def call(self, func: Callable[[], T], estimated_tokens: int, model: Optional[str] = None) -> T:
+        """Run a blocking LLM call under the governor (model only labels retry metrics)"""
+        for attempt in range(self.max_rate_limit_retries + 1):
+            self._acquire(estimated_tokens)
+            try:
+                return func()
+            except Exception as e:
+                if not self._should_retry(e, attempt, model):
+                    raise
+            finally:
+                self._release_slot()
+
+    async def call_async(
+        self,
+        func: Callable[[], Awaitable[T]],
+        estimated_tokens: int,
+        model: Optional[str] = None
+    ) -> T:
+        """Run an async LLM call under the governor (func is called again on each retry)"""
+        for attempt in range(self.max_rate_limit_retries + 1):
+            await self._acquire_async(estimated_tokens)
+            try:
+                return await func()
+            except Exception as e:
+                if not self._should_retry(e, attempt, model):
+                    raise
+            finally:
+                self._release_slot()
+
+    def reask_delay(self, tokens: int) -> float:
+        """Seconds an instructor re-ask of this size has to wait once charged (nothing is charged)"""
+        with self._lock:
+            self._refill()
+            request_budget = self._request_budget - 1
+            token_budget = self._token_budget - min(tokens, self.tokens_per_minute)
+
+            delay = max(0.0, self._blocked_until - time.monotonic())
+            if request_budget < 0:
+                delay = max(delay, -request_budget * 60 / self.requests_per_minute)
+            if token_budget < 0:
+                delay = max(delay, -token_budget * 60 / self.tokens_per_minute)
+            return delay
+
+    def charge(self, tokens: int) -> None:
+        """
+        Charge the buckets for an instructor re-ask sent from an acquired slot
+
+        The budgets may go negative; later callers then wait the debt off.
+        """
+        with self._lock:
+            self._refill()
+            self._request_budget -= 1
+            self._token_budget -= min(tokens, self.tokens_per_minute)
+            self._counters["calls"] += 1
+            self._counters["reasks"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait times and limiter state"""
+        with self._lock:
+            self._refill()
+            waits = sorted(self._waits)
+            counters = dict(self._counters)
+            state = {
+                "queue_depth": self._waiting,
+                "in_flight": self.max_in_flight - self._free_slots,
+                "slot_queue_depth": len(self._slot_waiters),
+                "max_in_flight": self.max_in_flight,
+                "request_budget": round(self._request_budget, 2),
+                "token_budget": round(self._token_budget),
+                "blocked_for_seconds": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+            }
+
+        state.update(counters)
+        state.update({
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "wait_seconds": {
+                "samples": len(waits),
+                "p50": round(waits[len(waits) // 2], 3) if waits else 0.0,
+                "p95": round(waits[int(len(waits) * 0.95)], 3) if waits else 0.0,
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        })
+        return state
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._request_budget = min(
+            float(self.requests_per_minute),
+            self._request_budget + elapsed * self.requests_per_minute / 60
+        )
+        self._token_budget = min(
+            float(self.tokens_per_minute),
+            self._token_budget + elapsed * self.tokens_per_minute / 60
+        )
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Take rate budget if available; otherwise return how long to wait before trying again"""
+        with self._lock:
+            self._refill()
+            now = time.monotonic()
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._request_budget < 1:
+                return (1 - self._request_budget) * 60 / self.requests_per_minute
+
+            # A request larger than the whole bucket may go once the bucket is full
+            needed = min(tokens, self.tokens_per_minute)
+            if self._token_budget < needed:
+                return (needed - self._token_budget) * 60 / self.tokens_per_minute
+
+            self._request_budget -= 1
+            self._token_budget -= needed
+            self._counters["calls"] += 1
+            return 0.0
+
+    def _start_wait(self) -> float:
+        with self._lock:
+            self._waiting += 1
+        return time.monotonic()
+
+    def _end_wait(self, started: float) -> None:
+        with self._lock:
+            self._waiting -= 1
+            self._waits.append(time.monotonic() - started)
+
+    def _take_slot(self) -> None:
+        with self._lock:
+            if self._free_slots > 0 and not self._slot_waiters:
+                self._free_slots -= 1
+                return
+            event = threading.Event()
+            self._slot_waiters.append(_SlotWaiter(event.set))
+        event.wait()
+
+    async def _take_slot_async(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free_slots > 0 and not self._slot_waiters:
+                self._free_slots -= 1
+                return
+            future = loop.create_future()
+            waiter = _SlotWaiter(lambda: loop.call_soon_threadsafe(_resolve, future))
+            self._slot_waiters.append(waiter)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._slot_waiters.remove(waiter)
+            if granted:
+                # The slot was handed over as we were cancelled: pass it on
+                self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            if not self._slot_waiters:
+                self._free_slots += 1
+                return
+            waiter = self._slot_waiters.popleft()
+            waiter.granted = True
+        waiter.wake()
+
+    def _acquire(self, tokens: int) -> None:
+        """Take an in-flight slot (FIFO), then wait for the rate budget"""
+        started = self._start_wait()
+        try:
+            self._take_slot()
+            try:
+                while (delay := self._try_acquire(tokens)) > 0:
+                    time.sleep(min(delay, 1.0))
+            except BaseException:
+                self._release_slot()
+                raise
+        finally:
+            self._end_wait(started)
+
+    async def _acquire_async(self, tokens: int) -> None:
+        started = self._start_wait()
+        try:
+            await self._take_slot_async()
+            try:
+                while (delay := self._try_acquire(tokens)) > 0:
+                    await asyncio.sleep(min(delay, 1.0))
+            except BaseException:
+                self._release_slot()
+                raise
+        finally:
+            self._end_wait(started)
+
+    def _should_retry(self, error: Exception, attempt: int, model: Optional[str] = None) -> bool:
+        """Record a failure and, for rate limits, pause every caller before retrying"""
+        rate_limit_error = find_rate_limit_error(error)
+
+        with self._lock:
+            if rate_limit_error is None or attempt >= self.max_rate_limit_retries:
+                self._counters["failures"] += 1
+                if rate_limit_error is not None:
+                    self._counters["rate_limited"] += 1
+                return False
+
+            delay = _retry_after_seconds(rate_limit_error)
+            if delay is None:
+                delay = Config.LLM_BACKOFF_BASE_SECONDS * (2 ** attempt) * (1 + random.random() * 0.25)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self._counters["rate_limited"] += 1
+            self._counters["retries"] += 1
+
+        record_llm_retry(model, "rate_limit")
+        logger.warning(
+            f"⏳ OpenRouter returned {rate_limit_error.status_code}, "
+            f"pausing LLM calls for {delay:.1f}s (retry {attempt + 1}/{self.max_rate_limit_retries})"
+        )
+        return True
+
+
+# Singleton instance
+_llm_governor = None
+
+def get_llm_governor() -> LLMGovernor:
+    """Get or create LLM governor instance"""
+    global _llm_governor
+    if _llm_governor is None:
+        _llm_governor = LLMGovernor(
+            requests_per_minute=Config.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=Config.LLM_TOKENS_PER_MINUTE,
+            max_in_flight=Config.LLM_MAX_IN_FLIGHT,
+            max_rate_limit_retries=Config.LLM_RATE_LIMIT_RETRIES
+        )
+    return _llm_governor
@@ -0,0 +1,161 @@
+"""
+Prometheus metrics for the extraction pipeline and database access
+"""
+import functools
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from src.services.extraction_trace import ExtractionTrace
+
+# Endpoint label for everything recorded while handling a request (CLI runs report "cli")
+_endpoint: ContextVar[str] = ContextVar("metrics_endpoint", default="cli")
+
+_STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+_DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+STAGE_SECONDS = Histogram(
+    "extraction_stage_seconds",
+    "Time spent in each extraction pipeline stage",
+    ["endpoint", "model", "stage"],
+    buckets=_STAGE_BUCKETS
+)
+EXTRACTIONS = Counter(
+    "extractions_total",
+    "Finished extractions by path taken and outcome",
+    ["endpoint", "model", "path", "status"]
+)
+PAGES = Counter(
+    "extraction_pages_total",
+    "PDF pages sent to the LLM",
+    ["endpoint", "model"]
+)
+PAYLOAD_BYTES = Counter(
+    "extraction_payload_bytes_total",
+    "Bytes of page images or text sent to the LLM",
+    ["endpoint", "model", "kind"]
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "LLM call retries (rate limits and instructor validation re-asks)",
+    ["endpoint", "model", "reason"]
+)
+VALIDATION_WARNINGS = Counter(
+    "validation_warnings_total",
+    "Validation warnings on extracted data, by warning type",
+    ["endpoint", "model", "type"]
+)
+EXTRACTIONS_IN_FLIGHT = Gauge(
+    "extractions_in_flight",
+    "Extractions currently running",
+    ["endpoint"]
+)
+DB_OPERATIONS_IN_FLIGHT = Gauge(
+    "db_operations_in_flight",
+    "Database operations currently running",
+    ["operation"]
+)
+DB_OPERATION_SECONDS = Histogram(
+    "db_operation_seconds",
+    "Duration of OperationsService database operations",
+    ["endpoint", "operation", "status"],
+    buckets=_DB_BUCKETS
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_PARENTHESIZED = re.compile(r"\([^)]*\)")
+
+
+def set_endpoint(endpoint: str) -> None:
+    """Label metrics recorded for the rest of the current request (task) with endpoint"""
+    _endpoint.set(endpoint)
+
+
+@contextmanager
+def endpoint_context(endpoint: str) -> Iterator[None]:
+    """Label metrics recorded in the enclosed block (and tasks it starts) with endpoint"""
+    token = _endpoint.set(endpoint)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def current_endpoint() -> str:
+    return _endpoint.get()
+
+
+@contextmanager
+def track_extraction(trace: ExtractionTrace) -> Iterator[None]:
+    """Count the enclosed extraction as in flight, then publish its trace"""
+    gauge = EXTRACTIONS_IN_FLIGHT.labels(current_endpoint())
+    gauge.inc()
+    status = "error"
+    try:
+        yield
+        status = "success"
+    finally:
+        gauge.dec()
+        record_extraction(trace, status)
+
+
+def record_extraction(trace: ExtractionTrace, status: str) -> None:
+    """Publish a finished (or failed) extraction's stages, pages and payload"""
+    endpoint = current_endpoint()
+    model = trace.model or "none"
+
+    for stage, seconds in trace.timings.items():
+        STAGE_SECONDS.labels(endpoint, model, stage).observe(seconds)
+    EXTRACTIONS.labels(endpoint, model, trace.path or "none", status).inc()
+
+    if trace.pages_used and trace.path in ("text", "vision"):
+        PAGES.labels(endpoint, model).inc(len(trace.pages_used))
+    for kind, num_bytes in trace.payload_bytes.items():
+        PAYLOAD_BYTES.labels(endpoint, model, kind).inc(num_bytes)
+
+
+def record_llm_retry(model: Optional[str], reason: str) -> None:
+    LLM_RETRIES.labels(current_endpoint(), model or "none", reason).inc()
+
+
+def warning_type(warning: str) -> str:
+    """Stable label for a validator message, e.g. "Missing MSN (...)" -> "missing_msn" """
+    return _NON_ALNUM.sub("_", _PARENTHESIZED.sub("", warning).lower()).strip("_")
+
+
+def record_validation_warnings(warnings: List[str], model: Optional[str]) -> None:
+    endpoint = current_endpoint()
+    for warning in warnings:
+        VALIDATION_WARNINGS.labels(endpoint, model or "none", warning_type(warning)).inc()
+
+
+def track_db_operation(operation: str):
+    """Decorator for async database methods: in-flight gauge and latency histogram"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            gauge = DB_OPERATIONS_IN_FLIGHT.labels(operation)
+            gauge.inc()
+            status = "ok"
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                gauge.dec()
+                DB_OPERATION_SECONDS.labels(current_endpoint(), operation, status).observe(
+                    time.perf_counter() - start
+                )
+        return wrapper
+    return decorator
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Return the Prometheus exposition body and its content type"""
+    return generate_latest(), CONTENT_TYPE_LATEST
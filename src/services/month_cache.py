@@ -0,0 +1,164 @@
+"""
+Read-through cache for per-month operations data
+"""
+import logging
+import threading
+from abc import ABC, abstractmethod
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.config.config import Config
+from src.utils.cache.lru_cache import LRUCache
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_LATENCY_SAMPLES = 1000
+
+
+class MonthCacheBackend(ABC):
+    """
+    Storage used by MonthCache
+
+    Methods are async so a shared backend (e.g. Redis) can be plugged in
+    for multi-worker deployments without touching the callers. A backend
+    missing get/set/delete fails when it is instantiated.
+    """
+
+    @abstractmethod
+    async def get(self, month: str) -> Optional[List[Dict[str, Any]]]:
+        """Cached rows for a month, or None on a miss"""
+
+    @abstractmethod
+    async def set(self, month: str, value: List[Dict[str, Any]]) -> None:
+        """Store a month's rows"""
+
+    @abstractmethod
+    async def delete(self, month: str) -> None:
+        """Drop a month's entry (no-op if absent)"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class MemoryMonthCacheBackend(MonthCacheBackend):
+    """Per-process backend: bounded LRU with per-entry TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float]):
+        self._cache = LRUCache(max_entries, ttl_seconds=ttl_seconds)
+
+    async def get(self, month: str) -> Optional[List[Dict[str, Any]]]:
+        return self._cache.get(month)
+
+    async def set(self, month: str, value: List[Dict[str, Any]]) -> None:
+        self._cache.set(month, value)
+
+    async def delete(self, month: str) -> None:
+        self._cache.delete(month)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "entries": len(self._cache),
+            "max_entries": self._cache.max_entries,
+            "ttl_seconds": self._cache.ttl_seconds,
+            "evictions": self._cache.evictions,
+        }
+
+
+class MonthCache:
+    """
+    Read-through cache of formatted lessees keyed by month
+
+    Writers call invalidate(month). Each month carries a generation number
+    bumped on invalidation, so a load that raced with a write is returned
+    to its caller but never stored.
+    """
+
+    def __init__(self, backend: MonthCacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+        self._hit_seconds = deque(maxlen=_LATENCY_SAMPLES)
+        self._miss_seconds = deque(maxlen=_LATENCY_SAMPLES)
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+        }
+
+    async def get_or_load(
+        self,
+        month: str,
+        loader: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Return the cached month, or load it with loader() and cache the result"""
+        if not self.enabled:
+            return await loader()
+
+        start = time.perf_counter()
+        cached = await self.backend.get(month)
+        if cached is not None:
+            self._record("hits", self._hit_seconds, start)
+            return cached
+
+        generation = self._generation(month)
+        value = await loader()
+        if generation == self._generation(month):
+            await self.backend.set(month, value)
+        self._record("misses", self._miss_seconds, start)
+        return value
+
+    async def invalidate(self, month: str) -> None:
+        """Drop a month after its data changed"""
+        with self._lock:
+            self._generations[month] = self._generations.get(month, 0) + 1
+            self._stats["invalidations"] += 1
+        await self.backend.delete(month)
+        logger.info(f"🧹 Invalidated cached operations data for {month}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit ratio, invalidations and hit/miss latency percentiles"""
+        with self._lock:
+            stats = dict(self._stats)
+            hits = sorted(self._hit_seconds)
+            misses = sorted(self._miss_seconds)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "enabled": self.enabled,
+            "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "hit_ms": _percentiles(hits),
+            "miss_ms": _percentiles(misses),
+        })
+        stats.update(self.backend.stats())
+        return stats
+
+    def _generation(self, month: str) -> int:
+        with self._lock:
+            return self._generations.get(month, 0)
+
+    def _record(self, counter: str, samples: deque, start: float) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+            samples.append(time.perf_counter() - start)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    return {
+        "samples": len(samples),
+        "p50": round(samples[len(samples) // 2] * 1000, 3) if samples else 0.0,
+        "p95": round(samples[int(len(samples) * 0.95)] * 1000, 3) if samples else 0.0,
+        "max": round(samples[-1] * 1000, 3) if samples else 0.0,
+    }
+
+
+def create_month_cache() -> MonthCache:
+    """Build the month cache configured by Config"""
+    backend = MemoryMonthCacheBackend(
+        max_entries=Config.MONTH_CACHE_MAX_ENTRIES,
+        ttl_seconds=Config.MONTH_CACHE_TTL_SECONDS or None
+    )
+    return MonthCache(backend, enabled=Config.MONTH_CACHE_ENABLED)
@@ -1,19 +1,11 @@
 import base64
 import instructor
-from openai import OpenAI
 
 from src.config.config import Config
 from src.models.invoice_response import InvoiceResponse
-
-
-
-base_client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=Config.OPENROUTER_API_KEY,
-)
-
-
-client = instructor.from_openai(base_client)
+from src.services.cache_service import get_extraction_cache, hash_bytes
+from src.services.http_clients import get_http_clients
+from src.services.llm_governor import estimate_request_tokens, get_llm_governor, instructor_retrying
 
 
 def extract_invoice_from_image(
@@ -23,39 +15,51 @@ def extract_invoice_from_image(
 ) -> InvoiceResponse:
    
     try:
+        cache = get_extraction_cache()
+        cache_key = cache.build_key(hash_bytes(file_buffer), prompt, Config.IMAGE_MODEL)
+        cached = cache.get(cache_key, InvoiceResponse)
+        if cached is not None:
+            return cached
        
         base64_file = base64.b64encode(file_buffer).decode('utf-8')
         
        
-        invoice = client.chat.completions.create(
-            model=Config.IMAGE_MODEL,
-            response_model=InvoiceResponse,  
-            max_retries=Config.MAX_RETRIES,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an AI that extracts structured invoice data. Extract all invoice information accurately."
-                },
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": prompt
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:{mime_type};base64,{base64_file}"
-                            }
+        messages = [
+            {
+                "role": "system",
+                "content": "You are an AI that extracts structured invoice data. Extract all invoice information accurately."
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": prompt
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime_type};base64,{base64_file}"
                         }
-                    ]
-                }
-            ],
-            temperature=Config.TEMPERATURE,
+                    }
+                ]
+            }
+        ]
+        
+        estimated_tokens = estimate_request_tokens(messages)
+        invoice = get_llm_governor().call(
+            lambda: get_http_clients().instructor_client().chat.completions.create(
+                model=Config.IMAGE_MODEL,
+                response_model=InvoiceResponse,  
+                max_retries=instructor_retrying(Config.IMAGE_MODEL, estimated_tokens),
+                messages=messages,
+                temperature=Config.TEMPERATURE,
+            ),
+            estimated_tokens=estimated_tokens,
+            model=Config.IMAGE_MODEL
         )
         
-        #
+        cache.put(cache_key, invoice)
         return invoice
     
     except Exception as e:
@@ -75,30 +79,37 @@ def extract_invoice_with_validation(
     try:
         base64_file = base64.b64encode(file_buffer).decode('utf-8')
         
-        invoice = client.chat.completions.create(
-            model=Config.IMAGE_MODEL,
-            response_model=InvoiceResponse,
-            max_retries=3,
-            validation_context={
-                "strict": True,  
+        messages = [
+            {
+                "role": "system",
+                "content": "Extract invoice data. If a field is missing, use null. All monetary values must be numbers."
             },
-            messages=[
-                {
-                    "role": "system",
-                    "content": "Extract invoice data. If a field is missing, use null. All monetary values must be numbers."
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": f"data:{mime_type};base64,{base64_file}"}
+                    }
+                ]
+            }
+        ]
+        
+        estimated_tokens = estimate_request_tokens(messages)
+        invoice = get_llm_governor().call(
+            lambda: get_http_clients().instructor_client().chat.completions.create(
+                model=Config.IMAGE_MODEL,
+                response_model=InvoiceResponse,
+                max_retries=instructor_retrying(Config.IMAGE_MODEL, estimated_tokens),
+                validation_context={
+                    "strict": True,  
                 },
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:{mime_type};base64,{base64_file}"}
-                        }
-                    ]
-                }
-            ],
-            temperature=0,
+                messages=messages,
+                temperature=0,
+            ),
+            estimated_tokens=estimated_tokens,
+            model=Config.IMAGE_MODEL
         )
         
         return invoice
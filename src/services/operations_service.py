@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+from datetime import timedelta
 from prisma import Prisma
 from prisma.models import Lessee, Asset, Component
 from src.models.operation_models import (
@@ -8,20 +9,61 @@ from src.models.operation_models import (
     AssetData,
     LesseeData
 )
+from src.config.config import Config
+from src.services.db_monitor import DatabaseMonitor, build_datasource_url
+from src.services.metrics import track_db_operation
+from src.services.month_cache import MonthCache, create_month_cache
+from src.utils.parser.metric_parser import METRIC_VALUE_COLUMNS, parse_metric
+from src.utils.parser.month_key import month_key
+import hashlib
+import json
 import logging
+import time
+import uuid
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Grouping keys allowed by get_aggregates (SQL expression, join needed)
+AGGREGATE_GROUPS = {
+    "month": ('c."month"', False),
+    "lessee": ('l."name"', True),
+    "component_type": ('c."type"', False),
+}
+
+
+def _new_id() -> str:
+    """Client-side primary key, so children can be inserted without reading parents back"""
+    return uuid.uuid4().hex
+
+
+def normalize_lessee_name(name: str) -> str:
+    """Key used for case-insensitive lessee lookups (stored in Lessee.normalizedName)"""
+    return name.strip().casefold()
+
+
+def lessee_content_hash(lessee: LesseeData) -> str:
+    """SHA-256 of a lessee's canonical JSON payload, used to skip unchanged upserts"""
+    payload = json.dumps(lessee.model_dump(), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 class OperationsService:
     """
     Service for handling operations data business logic
     """
     
-    def __init__(self):
-        self.db = Prisma(auto_register=True)
+    def __init__(self, month_cache: Optional[MonthCache] = None):
+        # Pool size and timeouts are passed to the query engine through the datasource URL
+        datasource_url = build_datasource_url(Config.DATABASE_URL)
+        self.db = Prisma(
+            auto_register=True,
+            datasource={"url": datasource_url} if datasource_url else None
+        )
         self._connected = False
+        self.month_cache = month_cache or create_month_cache()
+        self.monitor = DatabaseMonitor(self.db, datasource_url)
     
     async def connect(self):
         """Connect to database"""
@@ -37,6 +79,7 @@ class OperationsService:
             self._connected = False
             logger.info("👋 Database disconnected")
     
+    @track_db_operation("check_month_exists")
     async def check_month_exists(self, month: str) -> bool:
         """
         Check if data already exists for the given month
@@ -47,134 +90,215 @@ class OperationsService:
                 await self.connect()
             
             result = await self.db.lessee.find_first(
-                where={"month": month}
+                where={"month": month, "monthKey": month_key(month)}
             )
             return result is not None
         except Exception as e:
             logger.error(f"Error checking month existence: {e}")
             raise
     
+    @track_db_operation("save_operations_data")
     async def save_operations_data(
         self,
         lessees: List[LesseeData],
         month: str,
-        file_name: str
+        file_name: str,
+        upsert: bool = False
     ) -> Dict[str, Any]:
         """
         Save operations data to database
+        
+        All rows are written with batched create_many calls (lessees, then
+        assets, then components) inside a single transaction, so either the
+        whole month is saved or nothing is. Ids are generated client-side so
+        child rows can reference their parents without a read back.
+        
+        With upsert=True, lessees are matched on (name, month): those whose
+        content hash is unchanged are skipped, changed ones are deleted and
+        re-inserted in the same transaction, and lessees not in the payload
+        are left untouched.
         """
-        saved_lessees = 0
-        saved_assets = 0
-        saved_components = 0
         errors = []
+        written = []
+        unchanged = 0
+        replaced = 0
+        lessee_rows, asset_rows, component_rows = [], [], []
         
+        start = time.perf_counter()
         try:
             # Ensure connection
             if not self._connected:
                 await self.connect()
             
-            for lessee_data in lessees:
-                try:
-                    logger.info(f"💾 Saving lessee: {lessee_data.lesseeName}")
-                    
-                    # Create Lessee
-                    lessee = await self.db.lessee.create(
-                        data={
-                            "name": lessee_data.lesseeName,
-                            "month": month,
-                            "fileName": file_name,
-                        }
-                    )
-                    saved_lessees += 1
-                    logger.info(f"✅ Created lessee: {lessee_data.lesseeName} (ID: {lessee.id})")
-                    
-                    # Create Assets
-                    for asset_data in lessee_data.assets:
-                        try:
-                            asset = await self.db.asset.create(
-                                data={
-                                    "name": asset_data.name,
-                                    "serialNumber": asset_data.serialNumber,
-                                    "registrationNumber": asset_data.registrationNumber,
-                                    "validation_status": asset_data.validation_status,
-                                    "report_status": asset_data.report_status,
-                                    "obligation_status": asset_data.obligation_status,
-                                    "month": month,
-                                    "lesseeId": lessee.id
-                                }
-                            )
-                            saved_assets += 1
-                            logger.info(f"✅ Created asset: {asset_data.serialNumber}")
-                            
-                            # Create Components
-                            for component_data in asset_data.components:
-                                try:
-                                    component = await self.db.component.create(
-                                        data={
-                                            "type": component_data.type,
-                                            "serialNumber": component_data.serialNumber,
-                                            "lastUtilizationDate": component_data.lastUtilizationDate,
-                                            "flightHours": component_data.flightHours,
-                                            "flightCycles": component_data.flightCycles,
-                                            "apuHours": component_data.apuHours,
-                                            "apuCycles": component_data.apuCycles,
-                                            "tsnAtPeriod": component_data.tsnAtPeriod,
-                                            "csnAtPeriod": component_data.csnAtPeriod,
-                                            "tsnAtPeriodEnd": component_data.tsnAtPeriodEnd,
-                                            "csnAtPeriodEnd": component_data.csnAtPeriodEnd,
-                                            "lastTsnCsnUpdate": component_data.lastTsnCsnUpdate,
-                                            "lastTsnUtilization": component_data.lastTsnUtilization,
-                                            "lastCsnUtilization": component_data.lastCsnUtilization,
-                                            "attachmentStatus": component_data.attachmentStatus,
-                                            "engineThrust": component_data.engineThrust,
-                                            "status": component_data.status,
-                                            "utilReportStatus": component_data.utilReportStatus,
-                                            "asset_status": component_data.asset_status,
-                                            "derate": component_data.derate,
-                                            "month": month,
-                                            "assetId": asset.id
-                                        }
-                                    )
-                                    saved_components += 1
-                                    
-                                except Exception as e:
-                                    error_msg = f"Error saving component {component_data.serialNumber}: {str(e)}"
-                                    logger.error(error_msg)
-                                    errors.append(error_msg)
-                            
-                        except Exception as e:
-                            error_msg = f"Error saving asset {asset_data.serialNumber}: {str(e)}"
-                            logger.error(error_msg)
-                            errors.append(error_msg)
-                    
-                except Exception as e:
-                    error_msg = f"Error saving lessee {lessee_data.lesseeName}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+            # Partition DDL runs outside the write transaction to keep its lock short
+            key = month_key(month)
+            await self.db.query_raw("SELECT 1 FROM ensure_month_partitions($1)", key)
             
+            async with self.db.tx(timeout=timedelta(seconds=Config.DB_TX_TIMEOUT_SECONDS)) as tx:
+                # Serialize with other saves and deletes of the month key until the transaction ends
+                await tx.query_raw("SELECT 1 FROM pg_advisory_xact_lock(hashtext($1))", key)
+                # A delete may have dropped the partitions since; recreate them (no-op otherwise)
+                await tx.query_raw("SELECT 1 FROM ensure_month_partitions($1)", key)
+                
+                written = lessees
+                if upsert:
+                    written, replaced_ids = await self._diff_lessees(tx, lessees, month)
+                    unchanged = len(lessees) - len(written)
+                    replaced = len(replaced_ids)
+                    if replaced_ids:
+                        # Cascades to the replaced lessees' assets and components
+                        await tx.lessee.delete_many(where={"id": {"in": replaced_ids}})
+                
+                lessee_rows, asset_rows, component_rows = self._build_rows(written, month, file_name)
+                await self._create_in_batches(tx.lessee, lessee_rows)
+                await self._create_in_batches(tx.asset, asset_rows)
+                await self._create_in_batches(tx.component, component_rows)
+        
         except Exception as e:
-            error_msg = f"Database error: {str(e)}"
+            error_msg = f"Database error, nothing was saved: {str(e)}"
             logger.error(error_msg)
             errors.append(error_msg)
         
+        elapsed = time.perf_counter() - start
+        if written:
+            await self.month_cache.invalidate(month)
+        if errors:
+            return {
+                "saved_lessees": 0,
+                "saved_assets": 0,
+                "saved_components": 0,
+                "replaced_lessees": 0,
+                "unchanged_lessees": 0,
+                "duration_ms": round(elapsed * 1000, 1),
+                "rows_per_second": 0.0,
+                "errors": errors
+            }
+        
+        total_rows = len(lessee_rows) + len(asset_rows) + len(component_rows)
+        rows_per_second = round(total_rows / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"💾 Saved {total_rows} rows for {month} in {elapsed * 1000:.0f} ms ({rows_per_second} rows/s)"
+            + (f", {replaced} lessees replaced, {unchanged} unchanged" if upsert else "")
+        )
         return {
-            "saved_lessees": saved_lessees,
-            "saved_assets": saved_assets,
-            "saved_components": saved_components,
+            "saved_lessees": len(lessee_rows),
+            "saved_assets": len(asset_rows),
+            "saved_components": len(component_rows),
+            "replaced_lessees": replaced,
+            "unchanged_lessees": unchanged,
+            "duration_ms": round(elapsed * 1000, 1),
+            "rows_per_second": rows_per_second,
             "errors": errors
         }
     
+    async def _diff_lessees(
+        self,
+        tx: Prisma,
+        lessees: List[LesseeData],
+        month: str
+    ) -> Tuple[List[LesseeData], List[str]]:
+        """
+        Compare incoming lessees with the stored month by content hash
+        
+        Returns:
+            Tuple of (lessees to write, ids of stored lessees they replace)
+        """
+        # The caller holds the month key's advisory lock, so the stored rows cannot change under us
+        existing = await tx.lessee.find_many(
+            where={
+                "month": month,
+                "monthKey": month_key(month),
+                "name": {"in": [lessee.lesseeName for lessee in lessees]}
+            }
+        )
+        stored = {lessee.name: lessee for lessee in existing}
+        
+        to_write, replaced_ids = [], []
+        for lessee_data in lessees:
+            current = stored.get(lessee_data.lesseeName)
+            if current is not None and current.contentHash == lessee_content_hash(lessee_data):
+                continue
+            if current is not None:
+                replaced_ids.append(current.id)
+            to_write.append(lessee_data)
+        
+        return to_write, replaced_ids
+    
+    def _build_rows(
+        self,
+        lessees: List[LesseeData],
+        month: str,
+        file_name: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Flatten the request into lessee, asset and component rows linked by pre-generated ids
+        """
+        key = month_key(month)
+        lessee_rows, asset_rows, component_rows = [], [], []
+        
+        for lessee_data in lessees:
+            lessee_id = _new_id()
+            lessee_rows.append({
+                "id": lessee_id,
+                "name": lessee_data.lesseeName,
+                "normalizedName": normalize_lessee_name(lessee_data.lesseeName),
+                "contentHash": lessee_content_hash(lessee_data),
+                "month": month,
+                "monthKey": key,
+                "fileName": file_name,
+            })
+            
+            for asset_data in lessee_data.assets:
+                asset_id = _new_id()
+                asset_rows.append({
+                    "id": asset_id,
+                    "name": asset_data.name,
+                    "serialNumber": asset_data.serialNumber,
+                    "registrationNumber": asset_data.registrationNumber,
+                    "validation_status": asset_data.validation_status,
+                    "report_status": asset_data.report_status,
+                    "obligation_status": asset_data.obligation_status,
+                    "month": month,
+                    "monthKey": key,
+                    "lesseeId": lessee_id
+                })
+                
+                for component_data in asset_data.components:
+                    row = component_data.model_dump()
+                    row.update({
+                        value_column: parse_metric(row[column])
+                        for column, value_column in METRIC_VALUE_COLUMNS.items()
+                    })
+                    row.update({"id": _new_id(), "month": month, "monthKey": key, "assetId": asset_id})
+                    component_rows.append(row)
+        
+        return lessee_rows, asset_rows, component_rows
+    
+    async def _create_in_batches(self, actions, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows with create_many, Config.DB_BATCH_SIZE rows per statement"""
+        batch_size = max(1, Config.DB_BATCH_SIZE)
+        for start in range(0, len(rows), batch_size):
+            await actions.create_many(data=rows[start:start + batch_size])
+    
     async def get_operations_by_month(self, month: str) -> List[Dict[str, Any]]:
         """
-        Retrieve operations data for a specific month
+        Retrieve operations data for a specific month (read-through month cache)
+        """
+        return await self.month_cache.get_or_load(month, lambda: self._load_operations_by_month(month))
+    
+    @track_db_operation("get_operations_by_month")
+    async def _load_operations_by_month(self, month: str) -> List[Dict[str, Any]]:
+        """
+        Query and format one month of operations data
         """
         try:
             # Ensure connection
             if not self._connected:
                 await self.connect()
             
+            # monthKey lets Postgres prune the scan to the month's partitions
             lessees = await self.db.lessee.find_many(
-                where={"month": month},
+                where={"month": month, "monthKey": month_key(month)},
                 include={
                     "assets": {
                         "include": {
@@ -190,6 +314,7 @@ class OperationsService:
             logger.error(f"Error fetching operations by month: {e}")
             raise
     
+    @track_db_operation("get_all_operations")
     async def get_all_operations(self) -> List[Dict[str, Any]]:
         """
         Retrieve all operations data
@@ -215,19 +340,225 @@ class OperationsService:
             logger.error(f"Error fetching all operations: {e}")
             raise
     
+    @track_db_operation("get_operations_page")
+    async def get_operations_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve one page of operations data using keyset pagination on Lessee.id
+        
+        Args:
+            cursor: Id of the last lessee of the previous page (None for the first page)
+            limit: Maximum number of lessees to return
+            
+        Returns:
+            Tuple of (formatted lessees, cursor for the next page or None when done)
+        """
+        try:
+            # Ensure connection
+            if not self._connected:
+                await self.connect()
+            
+            # Fetch one extra row to know whether another page follows
+            lessees = await self.db.lessee.find_many(
+                where={"id": {"gt": cursor}} if cursor else None,
+                order={"id": "asc"},
+                take=limit + 1,
+                include={
+                    "assets": {
+                        "include": {
+                            "components": True
+                        }
+                    }
+                }
+            )
+            
+            next_cursor = lessees[limit - 1].id if len(lessees) > limit else None
+            return [self._format_lessee(lessee) for lessee in lessees[:limit]], next_cursor
+        
+        except Exception as e:
+            logger.error(f"Error fetching operations page: {e}")
+            raise
+    
+    async def iter_operations(self, page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every lessee, fetching page_size lessees at a time
+        """
+        cursor = None
+        while True:
+            page, cursor = await self.get_operations_page(cursor, page_size)
+            for lessee in page:
+                yield lessee
+            if cursor is None:
+                break
+    
+    @track_db_operation("backfill_normalized_names")
+    async def backfill_normalized_names(self, batch_size: int = 1000) -> int:
+        """
+        Recompute Lessee.normalizedName with normalize_lessee_name
+        
+        The column was first backfilled in SQL with lower(btrim(name)), which
+        differs from str.strip().casefold() for tabs/NBSP and casefold-only
+        mappings (e.g. "ß" -> "ss"), so those rows never matched a lookup.
+        Only rows whose stored value differs are updated.
+        
+        Returns:
+            Number of lessees updated
+        """
+        if not self._connected:
+            await self.connect()
+        
+        updated = 0
+        last_id = ""
+        while True:
+            rows = await self.db.query_raw(
+                'SELECT "id", "monthKey", "name", "normalizedName" FROM "lessees" '
+                'WHERE "id" > $1 ORDER BY "id" LIMIT $2',
+                last_id,
+                batch_size
+            )
+            if not rows:
+                break
+            
+            for row in rows:
+                normalized = normalize_lessee_name(row["name"])
+                if row["normalizedName"] != normalized:
+                    await self.db.lessee.update_many(
+                        where={"id": row["id"], "monthKey": row["monthKey"]},
+                        data={"normalizedName": normalized}
+                    )
+                    updated += 1
+            last_id = rows[-1]["id"]
+        
+        logger.info(f"🔤 Recomputed normalizedName for {updated} lessees")
+        return updated
+    
+    @track_db_operation("find_lessee_by_name")
+    async def find_lessee_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the most recently saved lessee with this name (case-insensitive)
+        
+        Uses the indexed normalizedName column, so only the matching lessee
+        and its assets/components are loaded.
+        """
+        try:
+            # Ensure connection
+            if not self._connected:
+                await self.connect()
+            
+            lessee = await self.db.lessee.find_first(
+                where={"normalizedName": normalize_lessee_name(name)},
+                order={"createdAt": "desc"},
+                include={
+                    "assets": {
+                        "include": {
+                            "components": True
+                        }
+                    }
+                }
+            )
+            
+            return self._format_lessee(lessee) if lessee else None
+        
+        except Exception as e:
+            logger.error(f"Error finding lessee by name: {e}")
+            raise
+    
+    @track_db_operation("get_aggregates")
+    async def get_aggregates(self, group_by: str, month: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fleet utilization aggregates computed in Postgres on the typed metric columns
+        
+        Args:
+            group_by: One of AGGREGATE_GROUPS ("month", "lessee", "component_type")
+            month: Restrict to one month (all months when None)
+            
+        Returns:
+            One row per group with component/asset counts, sums, averages and TSN/CSN ranges
+        """
+        if group_by not in AGGREGATE_GROUPS:
+            raise ValueError(f"Unsupported grouping: {group_by}. Supported: {', '.join(AGGREGATE_GROUPS)}")
+        group_expr, needs_lessee = AGGREGATE_GROUPS[group_by]
+        
+        joins = ""
+        if needs_lessee:
+            joins = (
+                # Join on the full (id, monthKey) keys so the planner can match partitions
+                'JOIN "assets" a ON a."id" = c."assetId" AND a."monthKey" = c."monthKey" '
+                'JOIN "lessees" l ON l."id" = a."lesseeId" AND l."monthKey" = a."monthKey"'
+            )
+        where = ""
+        if month is not None:
+            where = 'WHERE c."month" = $1 AND c."monthKey" = $2'
+            if needs_lessee:
+                # Repeat the key on every table so all three scans prune, not just components
+                where += ' AND a."monthKey" = $2 AND l."monthKey" = $2'
+        params = [month, month_key(month)] if month is not None else []
+        
+        sql = f"""
+            SELECT {group_expr} AS "{group_by}",
+                   COUNT(*)::int AS "components",
+                   COUNT(DISTINCT c."assetId")::int AS "assets",
+                   SUM(c."flightHoursValue") AS "total_flight_hours",
+                   SUM(c."flightCyclesValue") AS "total_flight_cycles",
+                   SUM(c."apuHoursValue") AS "total_apu_hours",
+                   SUM(c."apuCyclesValue") AS "total_apu_cycles",
+                   AVG(c."flightHoursValue") AS "avg_flight_hours",
+                   AVG(c."flightCyclesValue") AS "avg_flight_cycles",
+                   MIN(c."tsnAtPeriodEndValue") AS "min_tsn",
+                   MAX(c."tsnAtPeriodEndValue") AS "max_tsn",
+                   MIN(c."csnAtPeriodEndValue") AS "min_csn",
+                   MAX(c."csnAtPeriodEndValue") AS "max_csn"
+            FROM "components" c
+            {joins}
+            {where}
+            GROUP BY 1
+            ORDER BY 1
+        """
+        
+        try:
+            # Ensure connection
+            if not self._connected:
+                await self.connect()
+            
+            return await self.db.query_raw(sql, *params)
+        
+        except Exception as e:
+            logger.error(f"Error computing aggregates by {group_by}: {e}")
+            raise
+    
+    @track_db_operation("delete_operations_by_month")
     async def delete_operations_by_month(self, month: str) -> bool:
         """
         Delete operations data for a specific month
+        
+        When the month owns its partitions outright they are detached and
+        dropped, which is instant regardless of size. If other spellings of
+        the same month (e.g. "2024-01" and "January 2024") share the
+        partitions, or readers keep the parent tables busy for longer than
+        DB_PARTITION_LOCK_TIMEOUT_MS, only this month's rows are deleted.
+        The check and the drop run in one statement under the month key's
+        advisory lock, so a concurrent save cannot slip rows in between.
         """
         try:
             # Ensure connection
             if not self._connected:
                 await self.connect()
             
-            result = await self.db.lessee.delete_many(
-                where={"month": month}
+            rows = await self.db.query_raw(
+                'SELECT delete_month_operations($1, $2, $3) AS "outcome"',
+                month_key(month),
+                month,
+                Config.DB_PARTITION_LOCK_TIMEOUT_MS
             )
-            return result > 0
+            outcome = rows[0]["outcome"]
+            if outcome == "dropped":
+                logger.info(f"🗑️ Dropped partitions for {month}")
+            
+            await self.month_cache.invalidate(month)
+            return outcome != "missing"
         
         except Exception as e:
             logger.error(f"Error deleting operations by month: {e}")
@@ -286,6 +617,14 @@ class OperationsService:
             "status": component.status,
             "asset_status": component.asset_status,
             "derate": component.derate,
+            "flight_hours_value": component.flightHoursValue,
+            "flight_cycles_value": component.flightCyclesValue,
+            "apu_hours_value": component.apuHoursValue,
+            "apu_cycles_value": component.apuCyclesValue,
+            "tsn_at_period_value": component.tsnAtPeriodValue,
+            "csn_at_period_value": component.csnAtPeriodValue,
+            "tsn_at_period_end_value": component.tsnAtPeriodEndValue,
+            "csn_at_period_end_value": component.csnAtPeriodEndValue,
             "month": component.month,
             "created_at": component.createdAt.isoformat() if component.createdAt else None
         }
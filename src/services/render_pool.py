@@ -0,0 +1,101 @@
+"""
+Process pool for parallel PDF page rasterization
+"""
+import logging
+import math
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Sequence, Tuple
+
+import fitz
+
+from src.config.config import Config
+from src.utils.reader.pdf_reader import PdfSource, open_pdf
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (width, height, raw RGB samples) for one rendered page
+RenderedPage = Tuple[int, int, bytes]
+
+_render_pool = None
+_pool_lock = threading.Lock()
+
+
+def _render_page_slice(pdf_path: PdfSource, dpi: int, page_numbers: Sequence[int]) -> List[RenderedPage]:
+    """Worker entry point: open the document and render a slice of pages"""
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    pages = []
+
+    with open_pdf(pdf_path) as doc:
+        for page_num in page_numbers:
+            pix = doc.load_page(page_num).get_pixmap(matrix=mat, alpha=False, colorspace=fitz.csRGB)
+            pages.append((pix.width, pix.height, pix.samples))
+
+    return pages
+
+
+def get_render_pool() -> ProcessPoolExecutor:
+    """Get or create the shared render process pool"""
+    global _render_pool
+    with _pool_lock:
+        if _render_pool is None:
+            # Spawned workers do not inherit the server's threads and locks
+            _render_pool = ProcessPoolExecutor(
+                max_workers=Config.RENDER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"🧵 Started render pool with {Config.RENDER_PROCESSES} processes")
+        return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    """Stop the render process pool (called on application shutdown)"""
+    global _render_pool
+    with _pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+
+
+def _reset_broken_pool() -> None:
+    global _render_pool
+    with _pool_lock:
+        _render_pool = None
+
+
+def render_pages_parallel(pdf_path: PdfSource, dpi: int, page_numbers: Sequence[int]) -> Iterator[RenderedPage]:
+    """
+    Render pages across the process pool and yield them in page order
+
+    Args:
+        pdf_path: Path to the PDF file or its raw bytes (sent to each worker)
+        dpi: Render resolution
+        page_numbers: Zero-based page numbers to render
+
+    Yields:
+        (width, height, samples) per page, in page order
+    """
+    pool = get_render_pool()
+    page_numbers = list(page_numbers)
+    slice_size = math.ceil(len(page_numbers) / Config.RENDER_PROCESSES)
+
+    futures: List[Future] = []
+    try:
+        for start in range(0, len(page_numbers), slice_size):
+            page_slice = page_numbers[start:start + slice_size]
+            futures.append(pool.submit(_render_page_slice, pdf_path, dpi, page_slice))
+
+        for future in futures:
+            yield from future.result()
+
+    except BrokenProcessPool:
+        logger.error("❌ Render pool broke, it will be recreated on next use")
+        _reset_broken_pool()
+        raise
+
+    finally:
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,184 @@
+import base64
+import io
+import math
+from typing import Optional, Tuple
+
+from PIL import Image, ImageChops
+from pydantic import BaseModel, field_validator
+
+from src.config.config import Config
+
+MIME_TYPES = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+# Spellings accepted for IMAGE_FORMAT besides the PIL names above
+_FORMAT_ALIASES = {
+    "JPG": "JPEG",
+}
+
+# Vision models downscale to fit this square, then shrink the short side to 768px
+_VISION_FIT_SIDE = 2048
+_VISION_SHORT_SIDE = 768
+_VISION_TILE = 512
+_VISION_BASE_TOKENS = 85
+_VISION_TILE_TOKENS = 170
+
+# Above this many distinct colours (on a small sample) a page is treated as a scan/photo
+_PHOTO_COLOUR_THRESHOLD = 1024
+_SAMPLE_SIDE = 256
+# Base64 prefix decoded to find an image's dimensions (a multiple of 4)
+_HEADER_BASE64_CHARS = 8192
+
+
+class ImageEncodingPolicy(BaseModel):
+    """How page images are encoded for the vision payload"""
+    format: str = "auto"
+    quality: int = 85
+    grayscale: bool = True
+    downscale: bool = True
+    max_side: int = 0
+
+    @field_validator("format")
+    @classmethod
+    def _normalize_format(cls, value: str) -> str:
+        """"auto" or a PIL format name from MIME_TYPES (e.g. jpg -> JPEG)"""
+        if value.strip().lower() == "auto":
+            return "auto"
+        name = _FORMAT_ALIASES.get(value.strip().upper(), value.strip().upper())
+        if name not in MIME_TYPES:
+            supported = ", ".join(["auto", *MIME_TYPES, *_FORMAT_ALIASES])
+            raise ValueError(f"Unsupported image format '{value}', expected one of: {supported}")
+        return name
+
+    @classmethod
+    def from_config(cls) -> "ImageEncodingPolicy":
+        return cls(
+            format=Config.IMAGE_FORMAT,
+            quality=Config.IMAGE_QUALITY,
+            grayscale=Config.IMAGE_GRAYSCALE,
+            downscale=Config.IMAGE_DOWNSCALE,
+            max_side=Config.IMAGE_MAX_SIDE,
+        )
+
+    def signature(self) -> str:
+        """Stable string identifying the policy (used in cache keys)"""
+        return f"{self.format}:{self.quality}:{int(self.grayscale)}:{int(self.downscale)}:{self.max_side}"
+
+
+class EncodedImage(BaseModel):
+    """A page image encoded as a data URL"""
+    data_url: str
+    format: str
+    width: int
+    height: int
+    num_bytes: int
+    estimated_tokens: int
+
+
+def effective_vision_size(width: int, height: int) -> Tuple[int, int]:
+    """
+    Size the vision model actually looks at (high detail)
+
+    Anything sent above this is downscaled server-side, so it only costs
+    upload bytes.
+    """
+    scale = min(1.0, _VISION_FIT_SIDE / max(width, height))
+    width, height = width * scale, height * scale
+
+    scale = min(1.0, _VISION_SHORT_SIDE / min(width, height))
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Estimate the prompt tokens billed for one high-detail image"""
+    width, height = effective_vision_size(width, height)
+    tiles = math.ceil(width / _VISION_TILE) * math.ceil(height / _VISION_TILE)
+    return _VISION_BASE_TOKENS + _VISION_TILE_TOKENS * tiles
+
+
+def data_url_image_size(data_url: str) -> Optional[Tuple[int, int]]:
+    """
+    Read the pixel size of an image data URL from its header only
+
+    Returns None when the header cannot be parsed from the first few KB.
+    """
+    _, _, payload = data_url.partition("base64,")
+    try:
+        header = base64.b64decode(payload[:_HEADER_BASE64_CHARS])
+        with Image.open(io.BytesIO(header)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def _sample(image: Image.Image) -> Image.Image:
+    sample = image.copy()
+    sample.thumbnail((_SAMPLE_SIDE, _SAMPLE_SIDE), Image.NEAREST)
+    return sample
+
+
+def is_grayscale_content(image: Image.Image, tolerance: int = 16, max_colour_ratio: float = 0.002) -> bool:
+    """Check whether a page has no meaningful colour (stamps, highlights, logos)"""
+    if image.mode in ("L", "1"):
+        return True
+
+    red, green, blue = _sample(image).convert("RGB").split()
+    spread = ImageChops.lighter(ImageChops.difference(red, green), ImageChops.difference(green, blue))
+
+    histogram = spread.histogram()
+    coloured = sum(histogram[tolerance + 1:])
+    return coloured <= sum(histogram) * max_colour_ratio
+
+
+def _choose_format(image: Image.Image, policy: ImageEncodingPolicy) -> str:
+    if policy.format != "auto":
+        return policy.format
+
+    # Few distinct colours means generated text/tables: lossless PNG stays small and crisp
+    colours = _sample(image).getcolors(maxcolors=_PHOTO_COLOUR_THRESHOLD)
+    return "PNG" if colours is not None else "JPEG"
+
+
+def encode_image(image: Image.Image, policy: Optional[ImageEncodingPolicy] = None) -> EncodedImage:
+    """
+    Encode a page image for the vision payload according to the policy
+
+    Args:
+        image: Page image
+        policy: Encoding policy (defaults to the configured policy)
+
+    Returns:
+        EncodedImage with the data URL and its size/cost figures
+    """
+    policy = policy or ImageEncodingPolicy.from_config()
+
+    if policy.downscale:
+        target = effective_vision_size(*image.size)
+        if policy.max_side:
+            scale = min(1.0, policy.max_side / max(target))
+            target = (max(1, round(target[0] * scale)), max(1, round(target[1] * scale)))
+        if target != image.size:
+            image = image.resize(target, Image.LANCZOS)
+
+    if policy.grayscale and is_grayscale_content(image):
+        image = image.convert("L")
+
+    image_format = _choose_format(image, policy)
+
+    buffer = io.BytesIO()
+    if image_format == "PNG":
+        image.save(buffer, format="PNG", optimize=False)
+    else:
+        image.save(buffer, format=image_format, quality=policy.quality)
+    data = buffer.getvalue()
+
+    return EncodedImage(
+        data_url=f"data:{MIME_TYPES[image_format]};base64,{base64.b64encode(data).decode('utf-8')}",
+        format=image_format,
+        width=image.width,
+        height=image.height,
+        num_bytes=len(data),
+        estimated_tokens=estimate_image_tokens(image.width, image.height),
+    )
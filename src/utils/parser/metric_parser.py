@@ -0,0 +1,51 @@
+"""
+Parsing of utilization metrics reported as free-form strings
+"""
+import re
+from typing import Dict, Optional
+
+# String column on Component -> typed Float column holding its parsed value
+METRIC_VALUE_COLUMNS: Dict[str, str] = {
+    "flightHours": "flightHoursValue",
+    "flightCycles": "flightCyclesValue",
+    "apuHours": "apuHoursValue",
+    "apuCycles": "apuCyclesValue",
+    "tsnAtPeriod": "tsnAtPeriodValue",
+    "csnAtPeriod": "csnAtPeriodValue",
+    "tsnAtPeriodEnd": "tsnAtPeriodEndValue",
+    "csnAtPeriodEnd": "csnAtPeriodEndValue",
+}
+
+_NUMBER = re.compile(r"^-?[\d,]*\.?\d+$")
+_HOURS_MINUTES = re.compile(r"^(-?[\d,]+):([0-5]?\d)$")
+
+
+def parse_metric(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a reported metric into a number
+
+    Commas are treated as thousands separators ("12,345.6") and "HH:MM"
+    durations are converted to decimal hours ("1,234:30" -> 1234.5).
+    Must stay in step with parse_metric() in the typed-metrics migration.
+
+    Args:
+        value: Raw string from the report
+
+    Returns:
+        The parsed number, or None for blanks, "N/A" and anything unparseable
+    """
+    if value is None:
+        return None
+
+    text = value.strip().replace(" ", "")
+
+    match = _HOURS_MINUTES.match(text)
+    if match:
+        hours = float(match.group(1).replace(",", ""))
+        minutes = int(match.group(2)) / 60
+        return hours - minutes if text.startswith("-") else hours + minutes
+
+    if _NUMBER.match(text):
+        return float(text.replace(",", ""))
+
+    return None
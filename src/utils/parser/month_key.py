@@ -0,0 +1,42 @@
+"""
+Normalization of free-form report months into partition keys
+"""
+import re
+
+_MONTH_NAMES = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+
+_YEAR_MONTH = re.compile(r"^(\d{4})[-/. ](\d{1,2})$")
+_MONTH_YEAR = re.compile(r"^(\d{1,2})[-/. ](\d{4})$")
+_NAMED_MONTH = re.compile(r"^([a-z]{3})[a-z]*\.?[-/, ]*(\d{4})$")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def month_key(month: str) -> str:
+    """
+    Normalize a month string to the key its rows are partitioned by
+
+    "2024-1", "01/2024", "January 2024" and "Jan. 2024" all become "2024-01";
+    anything else is lowercased with non-alphanumerics collapsed to "_".
+    Must stay in step with operations_month_key() in the partitioning migration.
+
+    Args:
+        month: Month as sent by the client
+
+    Returns:
+        The month key
+    """
+    value = (month or "").strip().lower()
+
+    match = _YEAR_MONTH.match(value)
+    if match and 1 <= int(match.group(2)) <= 12:
+        return f"{match.group(1)}-{int(match.group(2)):02d}"
+
+    match = _MONTH_YEAR.match(value)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return f"{match.group(2)}-{int(match.group(1)):02d}"
+
+    match = _NAMED_MONTH.match(value)
+    if match and match.group(1) in _MONTH_NAMES:
+        return f"{match.group(2)}-{_MONTH_NAMES.index(match.group(1)) + 1:02d}"
+
+    return _NON_ALNUM.sub("_", value)
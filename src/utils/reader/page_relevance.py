@@ -0,0 +1,87 @@
+import logging
+from typing import List, Tuple
+
+import fitz
+
+from src.config.config import Config
+from src.utils.reader.pdf_reader import PdfSource, open_pdf
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Labels the extraction prompt relies on, weighted by how specific they are
+RELEVANCE_LABELS = {
+    "Total Time Since New": 3,
+    "Total Cycles Since New": 3,
+    "S/N of Engine Installed": 3,
+    "S/N of APU Installed": 3,
+    "Main Landing Gear": 3,
+    "Nose Landing Gear": 3,
+    "TSN": 2,
+    "CSN": 2,
+    "Utilization": 1,
+    "Flight Hours": 1,
+    "Registration": 1,
+    "MSN": 1,
+}
+
+# Pages with fewer characters than this are treated as scans
+_SCANNED_PAGE_MAX_CHARS = 20
+_INK_SAMPLE_DPI = 24
+_INK_THRESHOLD = 160
+
+
+def score_text_page(page: fitz.Page) -> int:
+    """Score a page with a text layer by the extraction labels it contains"""
+    return sum(weight for label, weight in RELEVANCE_LABELS.items() if page.search_for(label))
+
+
+def ink_ratio(page: fitz.Page) -> float:
+    """Fraction of dark pixels on a tiny grayscale render (blank and signature pages score low)"""
+    pix = page.get_pixmap(matrix=fitz.Matrix(_INK_SAMPLE_DPI / 72, _INK_SAMPLE_DPI / 72), colorspace=fitz.csGRAY)
+    samples = pix.samples
+    return sum(1 for value in samples if value < _INK_THRESHOLD) / max(1, len(samples))
+
+
+def select_relevant_pages(source: PdfSource) -> Tuple[int, List[int]]:
+    """
+    Pick the pages worth sending to the LLM
+
+    Text pages are kept when they mention enough of the utilization labels;
+    scanned pages are kept unless they are nearly blank.
+
+    Args:
+        source: Path to the PDF file or its raw bytes
+
+    Returns:
+        Tuple of (page count, zero-based page numbers to use in order)
+    """
+    page_count = 0
+    try:
+        with open_pdf(source) as doc:
+            page_count = len(doc)
+            selected = []
+
+            for page_num in range(page_count):
+                page = doc.load_page(page_num)
+
+                if len(page.get_text("text").strip()) < _SCANNED_PAGE_MAX_CHARS:
+                    keep = ink_ratio(page) >= Config.PAGE_MIN_INK_RATIO
+                else:
+                    keep = score_text_page(page) >= Config.PAGE_RELEVANCE_MIN_SCORE
+
+                if keep:
+                    selected.append(page_num)
+
+    except Exception as e:
+        logger.warning(f"⚠️ Page relevance scoring failed ({e}), using all pages")
+        return page_count, list(range(page_count))
+
+    if not selected:
+        logger.info("📄 No page matched the utilization labels, using all pages")
+        return page_count, list(range(page_count))
+
+    skipped = page_count - len(selected)
+    if skipped:
+        logger.info(f"📄 Using pages {[p + 1 for p in selected]} of {page_count}, skipped {skipped}")
+    return page_count, selected
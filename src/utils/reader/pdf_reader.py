@@ -0,0 +1,50 @@
+"""
+Opening PDFs from disk or memory
+"""
+from typing import BinaryIO, Union
+
+import fitz
+
+# A PDF given either as a path on disk or as its raw bytes
+PdfSource = Union[str, bytes, bytearray]
+
+# Anything the extraction entry points accept, including open binary streams
+PdfInput = Union[PdfSource, BinaryIO]
+
+PDF_MAGIC = b"%PDF-"
+
+# Readers accept the header anywhere in the first KB (after a BOM, whitespace or junk)
+PDF_HEADER_WINDOW = 1024
+
+
+def has_pdf_header(data: Union[bytes, bytearray]) -> bool:
+    """True if %PDF- appears within the first PDF_HEADER_WINDOW bytes"""
+    return PDF_MAGIC in data[:PDF_HEADER_WINDOW]
+
+
+def file_has_pdf_header(file_path: str) -> bool:
+    """has_pdf_header on the start of a file on disk"""
+    with open(file_path, "rb") as f:
+        return has_pdf_header(f.read(PDF_HEADER_WINDOW))
+
+
+def read_pdf_source(source: PdfInput) -> PdfSource:
+    """Read a binary stream into bytes; paths and bytes are returned unchanged"""
+    if isinstance(source, (str, bytes, bytearray)):
+        return source
+    source.seek(0)
+    return source.read()
+
+
+def open_pdf(source: PdfSource) -> fitz.Document:
+    """Open a PDF from a path or directly from memory"""
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def describe_source(source: PdfSource) -> str:
+    """Short description of a PDF source for log messages"""
+    if isinstance(source, str):
+        return source
+    return f"<in-memory PDF, {len(source)} bytes>"
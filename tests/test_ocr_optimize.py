@@ -0,0 +1,69 @@
+"""
+Parity of the fused _optimize_image_for_ocr with the original PIL chain
+"""
+import os
+import random
+
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+
+import pytest
+from PIL import Image, ImageDraw
+
+from benchmarks.ocr_reference import diff_stats, legacy_optimize, within_tolerance
+from src.services.aircraft_service import _optimize_image_for_ocr
+
+def _report_page() -> Image.Image:
+    """A scanned-report lookalike: off-white paper, table rules, text and a stamp"""
+    rng = random.Random(7)
+    image = Image.new("RGB", (800, 600), (246, 244, 238))
+    draw = ImageDraw.Draw(image)
+
+    for y in range(60, 560, 40):
+        draw.line([(40, y), (760, y)], fill=(90, 90, 90), width=1)
+    for x in (40, 240, 440, 600, 760):
+        draw.line([(x, 60), (x, 540)], fill=(90, 90, 90), width=1)
+    for row in range(12):
+        for col, x in enumerate((50, 250, 450, 610)):
+            value = f"{rng.randint(0, 99999):,}.{rng.randint(0, 9)}" if col else f"ESN {rng.randint(100000, 999999)}"
+            draw.text((x, 72 + row * 40), value, fill=(20, 20, 30))
+    draw.ellipse([(560, 420), (740, 560)], outline=(40, 60, 170), width=4)
+    draw.text((600, 480), "APPROVED", fill=(40, 60, 170))
+
+    # Scanner noise
+    pixels = image.load()
+    for _ in range(4000):
+        x, y = rng.randrange(image.width), rng.randrange(image.height)
+        shade = rng.randint(150, 255)
+        pixels[x, y] = (shade, shade, shade)
+    return image
+
+
+def _photo_page() -> Image.Image:
+    """A dark, low-contrast photo of a page: smooth gradients rather than flat paper"""
+    image = Image.linear_gradient("L").resize((640, 480)).convert("RGB")
+    image = Image.blend(image, Image.new("RGB", image.size, (70, 60, 50)), 0.6)
+    draw = ImageDraw.Draw(image)
+    for row in range(10):
+        draw.text((30, 30 + row * 40), f"FH 12,{row}34.5  FC 8,{row}12", fill=(15, 15, 15))
+    return image
+
+
+@pytest.mark.parametrize("page", [_report_page, _photo_page], ids=["report", "photo"])
+def test_fused_optimize_matches_legacy_chain(page):
+    image = page()
+
+    fused = _optimize_image_for_ocr(image)
+    legacy = legacy_optimize(image)
+
+    assert fused.size == legacy.size
+    assert fused.mode == "RGB"
+    assert within_tolerance(*diff_stats(legacy, fused))
+
+
+def test_optimize_converts_grayscale_input():
+    image = _report_page().convert("L")
+
+    fused = _optimize_image_for_ocr(image)
+
+    assert fused.mode == "RGB"
+    assert within_tolerance(*diff_stats(legacy_optimize(image.convert("RGB")), fused))